@@ -0,0 +1,85 @@
+import heapq
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from config.settings import MAX_ALERTS_PER_DAY, COOLDOWN_HOURS
+from database.models import get_cooldowns, get_alerts_today, record_alert
+
+def _utcnow():
+    # SQLite's datetime('now') is naive UTC; compare like with like
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class AlertState:
+    """
+    Ticker cooldowns and the daily alert count, held in memory
+    Loaded once at startup and written through to SQLite on every alert,
+    so the send loop never has to query the database per signal.
+    """
+    
+    def __init__(self, max_per_day=MAX_ALERTS_PER_DAY, cooldown_hours=COOLDOWN_HOURS):
+        self.max_per_day = max_per_day
+        self.cooldown = timedelta(hours=cooldown_hours)
+        self.last_alert = {}  # ticker -> naive UTC datetime
+        self.day = _utcnow().date()
+        self.sent = 0
+        self.stats = Counter()
+    
+    async def load(self):
+        """Read cooldowns still in force and today's count from the database"""
+        self.last_alert = {
+            ticker: datetime.fromisoformat(last_alert)
+            for ticker, last_alert in (await get_cooldowns(self.cooldown.total_seconds() / 3600)).items()
+        }
+        self.day = _utcnow().date()
+        self.sent = await get_alerts_today()
+    
+    def sent_today(self):
+        """Alerts sent since midnight UTC"""
+        today = _utcnow().date()
+        if today != self.day:
+            self.day, self.sent = today, 0
+        return self.sent
+    
+    def remaining_today(self):
+        return max(0, self.max_per_day - self.sent_today())
+    
+    def is_on_cooldown(self, ticker, now=None):
+        last_alert = self.last_alert.get(ticker)
+        return last_alert is not None and last_alert > (now or _utcnow()) - self.cooldown
+    
+    def select(self, signals, k=None):
+        """
+        Best alert candidates: one signal per ticker (highest confidence),
+        cooled-down tickers skipped, top k by confidence via a heap
+        Returns: up to k signals, highest confidence first
+        """
+        k = self.remaining_today() if k is None else k
+        
+        best = {}
+        for signal in signals:
+            current = best.get(signal['ticker'])
+            if current is None or signal['confidence'] > current['confidence']:
+                best[signal['ticker']] = signal
+        self.stats['collapsed'] += len(signals) - len(best)
+        
+        now = _utcnow()
+        candidates = [signal for ticker, signal in best.items() if not self.is_on_cooldown(ticker, now)]
+        self.stats['cooldown'] += len(best) - len(candidates)
+        
+        return heapq.nlargest(k, candidates, key=lambda signal: signal['confidence'])
+    
+    async def record(self, signal):
+        """Mark an alert as sent, in memory at once and in SQLite atomically"""
+        self.last_alert[signal['ticker']] = _utcnow()
+        self.sent_today()  # Roll the day over first if needed
+        self.sent += 1
+        return await record_alert(signal)
+
+# Global instance (loaded in on_ready)
+alert_state = None
+
+def get_alert_state():
+    """Get or create alert state singleton"""
+    global alert_state
+    if alert_state is None:
+        alert_state = AlertState()
+    return alert_state
@@ -0,0 +1,219 @@
+"""
+Micro-benchmarks for the scan hot paths
+
+Usage:
+    python benchmarks.py feed_parser [recorded_feed.xml ...]
+    python benchmarks.py ticker_matcher
+    python benchmarks.py extractor
+    python benchmarks.py sentiment [items]
+    python benchmarks.py query_plans [db_path]   # Exit 1 if a hot query misses its index
+
+Without arguments each benchmark runs on a synthetic corpus.
+"""
+
+import os
+import random
+import re
+import string
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _best_of(fn, repeat=5):
+    """Best wall time of `repeat` runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _synthetic_feed(items=2000):
+    """RSS 2.0 document with `items` entries, one every 5 minutes"""
+    now = datetime.utcnow()
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Synthetic</title>']
+    for i in range(items):
+        pub = (now - timedelta(minutes=5 * i)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+        parts.append(
+            f'<item><title>NVDA announces product {i}</title>'
+            f'<link>https://nvidianews.nvidia.com/news/{i}</link>'
+            f'<guid>item-{i}</guid>'
+            f'<description>&lt;p&gt;NVIDIA revenue $35.1 billion, up {i % 50}%&lt;/p&gt;</description>'
+            f'<category>Press</category><pubDate>{pub}</pubDate></item>'
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode()
+
+def bench_feed_parser(paths):
+    """Streaming lxml backend vs feedparser on recorded (or synthetic) feeds"""
+    from ingestion.feed_parser import parse_entries
+    
+    if paths:
+        docs = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                docs.append((os.path.basename(path), f.read()))
+    else:
+        docs = [('synthetic-2000.xml', _synthetic_feed())]
+    
+    since = datetime.utcnow() - timedelta(hours=24)
+    
+    print(f"{'feed':<28}{'entries':>9}{'feedparser':>13}{'fast':>10}{'fast+24h':>11}{'speedup':>9}")
+    for name, body in docs:
+        slow_entries = parse_entries(body, backend='feedparser')
+        fast_entries = parse_entries(body, backend='fast')
+        
+        mismatches = sum(
+            1 for a, b in zip(slow_entries, fast_entries)
+            if (a['title'], a['link']) != (b['title'], b['link'])
+        )
+        if len(slow_entries) != len(fast_entries) or mismatches:
+            print(f"  ⚠️  {name}: backends disagree "
+                  f"({len(slow_entries)} vs {len(fast_entries)} entries, {mismatches} mismatched)")
+        
+        slow = _best_of(lambda: parse_entries(body, backend='feedparser'))
+        fast = _best_of(lambda: parse_entries(body, backend='fast'))
+        windowed = _best_of(lambda: parse_entries(body, since=since, backend='fast'))
+        
+        print(f"{name[:27]:<28}{len(slow_entries):>9}{slow * 1000:>11.1f}ms"
+              f"{fast * 1000:>8.1f}ms{windowed * 1000:>9.1f}ms{slow / fast:>8.1f}x")
+
+SAMPLE_HEADLINES = [
+    "NVIDIA announces record data center revenue of $30.8 billion, up 112%",
+    "Apple Inc. files 8-K: departure of chief operating officer",
+    "Fed holds rates steady as inflation cools; Treasury yields fall",
+    "Taiwan Semi and ASML shares slide after export curbs widen",
+    "Microsoft to acquire gaming studio in $2.1B all-cash deal",
+    "Costco reports same-store sales up 7.1% in September",
+]
+
+def bench_ticker_matcher(args):
+    """Per-ticker regex loop vs one compiled matcher as the watchlist grows"""
+    from processing.ticker_matcher import TickerMatcher
+    from config.settings import WATCHLIST
+    from config.sources import COMPANY_ALIASES
+    
+    def legacy_first(text, tickers):
+        text_upper = text.upper()
+        for ticker in tickers:
+            if re.search(r'\b' + re.escape(ticker) + r'\b', text_upper):
+                return ticker
+        return None
+    
+    rng = random.Random(7)
+    print(f"{'tickers':>8}{'legacy/item':>14}{'compiled/item':>16}{'build':>10}")
+    for size in (30, 300, 3000):
+        tickers = list(WATCHLIST)
+        while len(tickers) < size:
+            tickers.append(''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 5))))
+        
+        started = time.perf_counter()
+        matcher = TickerMatcher(tickers, COMPANY_ALIASES)
+        build = time.perf_counter() - started
+        
+        legacy = _best_of(lambda: [legacy_first(h, tickers) for h in SAMPLE_HEADLINES], repeat=3)
+        compiled = _best_of(lambda: [matcher.find_all(h) for h in SAMPLE_HEADLINES])
+        
+        per_item = len(SAMPLE_HEADLINES)
+        print(f"{size:>8}{legacy / per_item * 1e6:>12.1f}us{compiled / per_item * 1e6:>14.1f}us"
+              f"{build * 1000:>8.1f}ms")
+
+def bench_extractor(args):
+    """Precompiled entity extraction vs the previous per-call regexes and keyword scans"""
+    from processing.extractor import _event_type, _numbers
+    from test_extractor import GOLDEN_TEXTS, legacy_extract, golden_mismatches
+    
+    # Golden check: the pre-existing fields must come out unchanged (also run by pytest)
+    mismatches = golden_mismatches()
+    for text, legacy, new in mismatches:
+        print(f"  ⚠️  mismatch: {text!r}")
+        print(f"      legacy: {legacy}")
+        print(f"      new:    {new}")
+    print(f"Golden corpus: {len(GOLDEN_TEXTS) - len(mismatches)}/{len(GOLDEN_TEXTS)} identical")
+    
+    def current(text):
+        text_lower = text.lower()
+        return _event_type(text_lower), _numbers(text_lower)
+    
+    # Headlines alone, and headlines followed by a typical article summary
+    body = (" Shares rose in premarket trading after the announcement as analysts "
+            "reiterated their ratings, citing strong demand across segments.") * 3
+    corpora = [('headline', GOLDEN_TEXTS * 50), ('headline+summary', [t + body for t in GOLDEN_TEXTS] * 50)]
+    
+    print(f"{'items':<20}{'legacy/item':>14}{'compiled/item':>16}")
+    for name, corpus in corpora:
+        old = _best_of(lambda: [legacy_extract(text) for text in corpus])
+        new = _best_of(lambda: [current(text) for text in corpus])
+        
+        per_item = len(corpus)
+        print(f"{name:<20}{old / per_item * 1e6:>12.1f}us{new / per_item * 1e6:>14.1f}us")
+    
+    if mismatches:
+        sys.exit(1)
+
+def bench_sentiment(args):
+    """Per-item FinBERT calls vs length-bucketed batches (needs the model)"""
+    from processing.sentiment import get_sentiment_analyzer
+    
+    analyzer = get_sentiment_analyzer()
+    if not analyzer.enabled:
+        print("FinBERT is not available; nothing to benchmark")
+        return
+    
+    # Mixed lengths, like a scan: bare headlines next to long summaries
+    items = int(args[0]) if args else 64
+    rng = random.Random(7)
+    texts = [
+        ' '.join(rng.choice(SAMPLE_HEADLINES) for _ in range(rng.choice((1, 1, 2, 5, 12))))
+        for _ in range(items)
+    ]
+    
+    analyzer.analyze_many(texts[:4])  # Warm up
+    per_item = _best_of(lambda: [analyzer.analyze(text) for text in texts], repeat=2)
+    batched = _best_of(lambda: analyzer.analyze_many(texts), repeat=2)
+    
+    single = [analyzer.analyze(text)['label'] for text in texts]
+    agree = sum(a == b['label'] for a, b in zip(single, analyzer.analyze_many(texts)))
+    
+    print(f"{'items':>6}{'per-item':>14}{'batched':>14}{'speedup':>9}{'agree':>8}")
+    print(f"{items:>6}{items / per_item:>10.1f}/sec{items / batched:>10.1f}/sec"
+          f"{per_item / batched:>8.1f}x{agree:>5}/{items}")
+
+def bench_query_plans(args):
+    """Check the hot queries use their indexes (on a scratch copy of the schema by default)"""
+    import asyncio
+    import tempfile
+    import database.models as models
+    
+    models.DB_PATH = args[0] if args else os.path.join(tempfile.mkdtemp(), 'plans.db')
+    
+    async def run():
+        await models.init_database()
+        report = await models.check_query_plans()
+        await models.close_database()
+        return report
+    
+    report = asyncio.run(run())
+    for name, plan, ok in report:
+        print(f"{'✅' if ok else '❌'} {name:<26}{plan}")
+    if not all(ok for _, _, ok in report):
+        sys.exit(1)
+
+BENCHMARKS = {
+    'feed_parser': bench_feed_parser,
+    'ticker_matcher': bench_ticker_matcher,
+    'extractor': bench_extractor,
+    'sentiment': bench_sentiment,
+    'query_plans': bench_query_plans,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(f"Usage: python benchmarks.py [{'|'.join(BENCHMARKS)}] [args...]")
+        sys.exit(1)
+    
+    BENCHMARKS[sys.argv[1]](sys.argv[2:])
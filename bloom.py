@@ -0,0 +1,121 @@
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from config.settings import (
+    CONTENT_DEDUP_DAYS, BLOOM_ITEMS_PER_DAY, BLOOM_FALSE_POSITIVE_RATE, BLOOM_MAX_BYTES
+)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex SHA-256 content hashes"""
+    
+    def __init__(self, num_bits, num_hashes):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, content_hash):
+        # The hash is already uniform, so two slices of it drive double hashing
+        h1 = int(content_hash[:16], 16)
+        h2 = int(content_hash[16:32], 16) | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, content_hash):
+        for position in self._positions(content_hash):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, content_hash):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(content_hash))
+
+class RotatingBloomFilter:
+    """
+    One Bloom filter per UTC day, covering the last CONTENT_DEDUP_DAYS days
+    A miss in every filter means the hash is definitely new, so only
+    "maybe seen" hashes need an exact check in content_cache. Whole days
+    are kept, so the window spans CONTENT_DEDUP_DAYS + 1 filters; each is
+    sized so all of them at BLOOM_ITEMS_PER_DAY stay within
+    BLOOM_FALSE_POSITIVE_RATE overall, shrunk to fit BLOOM_MAX_BYTES if needed.
+    Days are UTC, like content_cache.created_at.
+    """
+    
+    def __init__(self, days=CONTENT_DEDUP_DAYS, items_per_day=BLOOM_ITEMS_PER_DAY,
+                 false_positive_rate=BLOOM_FALSE_POSITIVE_RATE, max_bytes=BLOOM_MAX_BYTES):
+        self.days = days
+        self.items_per_day = items_per_day
+        self.max_filters = days + 1  # Today plus `days` whole days back
+        
+        # Optimal size for the per-day share of the target, capped by the memory budget
+        per_day_rate = 1 - (1 - false_positive_rate) ** (1 / self.max_filters)
+        num_bits = math.ceil(-items_per_day * math.log(per_day_rate) / math.log(2) ** 2)
+        self.num_bits = min(num_bits, max_bytes // self.max_filters * 8)
+        self.num_hashes = max(1, round(self.num_bits / items_per_day * math.log(2)))
+        
+        self.filters = {}  # date ordinal -> BloomFilter
+        self.loaded = False
+        self.stats = Counter()
+    
+    def _rotate(self, today):
+        for day in [day for day in self.filters if day < today - self.days]:
+            del self.filters[day]
+            self.stats['rotations'] += 1
+    
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date().toordinal()
+    
+    def add(self, content_hash, day=None):
+        """Record a hash as seen on `day` (a date; today by default)"""
+        today = self._today()
+        day = today if day is None else day.toordinal()
+        if day < today - self.days:
+            return  # Whole days are kept, so the filter covers at least the SQL window
+        
+        self._rotate(today)
+        if day not in self.filters:
+            self.filters[day] = BloomFilter(self.num_bits, self.num_hashes)
+        self.filters[day].add(content_hash)
+    
+    def might_contain(self, content_hash):
+        """False means definitely not seen in the window; True means check the database"""
+        self._rotate(self._today())
+        self.stats['checks'] += 1
+        if any(content_hash in bloom for bloom in self.filters.values()):
+            self.stats['maybe'] += 1
+            return True
+        self.stats['definite_misses'] += 1
+        return False
+    
+    def record_false_positive(self, count=1):
+        """Count "maybe" answers the database showed to be new"""
+        self.stats['false_positives'] += count
+    
+    def memory_bytes(self):
+        return sum(len(bloom.bits) for bloom in self.filters.values())
+    
+    def configured_false_positive_rate(self):
+        """Rate a full window of BLOOM_ITEMS_PER_DAY per day would give (after any memory cap)"""
+        per_day = (1 - math.exp(-self.num_hashes * self.items_per_day / self.num_bits)) ** self.num_hashes
+        return 1 - (1 - per_day) ** self.max_filters
+    
+    def observed_false_positive_rate(self):
+        """False positives over all checks of hashes that turned out to be new"""
+        negatives = self.stats['definite_misses'] + self.stats['false_positives']
+        return self.stats['false_positives'] / negatives if negatives else 0.0
+    
+    def summary(self):
+        """One-line report for logs and !status"""
+        items = sum(bloom.count for bloom in self.filters.values())
+        return (f"{items} hashes over {len(self.filters)} days, {self.memory_bytes() / 1024:.0f} KB, "
+                f"FP rate {self.observed_false_positive_rate():.2%} observed / "
+                f"{self.configured_false_positive_rate():.2%} configured")
+
+# Global instance (filled from content_cache by init_database)
+content_filter = None
+
+def get_content_filter():
+    """Get or create content dedup filter singleton"""
+    global content_filter
+    if content_filter is None:
+        content_filter = RotatingBloomFilter()
+    return content_filter
@@ -1,29 +1,55 @@
+import time
+STARTED_AT = time.monotonic()  # Before the heavy imports, for startup timing
+
 import discord
 from discord.ext import commands, tasks
 import asyncio
+from functools import partial
 import sys
 import os
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import DISCORD_BOT_TOKEN, ALERT_CHANNEL_ID, MAX_ALERTS_PER_DAY, COOLDOWN_HOURS
+from config.settings import (
+    DISCORD_BOT_TOKEN, ALERT_CHANNEL_ID, MAX_ALERTS_PER_DAY,
+    SOURCE_TIMEOUTS, SCAN_TIMEOUT, STARTUP_IMPORT_REPORT, DB_MAINTENANCE_HOURS
+)
 from database.models import (
-    init_database, save_signal, is_on_cooldown, 
-    update_cooldown, get_alerts_today, log_alert
+    init_database, close_database, get_writer, run_retention
 )
+from database.bloom import get_content_filter
 from ingestion.sec_edgar import SECIngestor
 from ingestion.rss_feeds import RSSIngestor
 from ingestion.fred_data import FREDIngestor
 from ingestion.yahoo_finance import YahooFinanceIngestor
+from ingestion.http_client import get_http_client
+from ingestion.watermark import Watermarks
+from processing.sentiment import get_sentiment_cache
+from processing.sentiment_worker import get_sentiment_worker, warm_up
 from processing.validator import ContentValidator
+from processing.near_dup import get_near_duplicate_filter
 from signals.detector import SignalDetector
+from signals.clustering import cluster_signals
+from signals.alert_state import get_alert_state
 from discord_bot.formatter import AlertFormatter
 
+class MarketIntelBot(commands.Bot):
+    """Bot that releases its shared resources on shutdown"""
+    
+    async def close(self):
+        check_signals.cancel()
+        maintain_database.cancel()
+        await get_sentiment_worker().close()
+        await get_http_client().close()
+        await close_database()
+        print("👋 Shut down cleanly")
+        await super().close()
+
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+bot = MarketIntelBot(command_prefix='!', intents=intents)
 
 # Initialize components
 sec_ingestor = SECIngestor()
@@ -38,14 +64,35 @@ formatter = AlertFormatter()
 async def on_ready():
     """Bot startup"""
     print(f'✅ {bot.user} is now running!')
-    print(f'📡 Monitoring {len(ALERT_CHANNEL_ID)} channel(s)')
+    print(f'⏱️  Connected {time.monotonic() - STARTED_AT:.1f}s after start')
+    print(f'📡 Alerting to channel {ALERT_CHANNEL_ID}')
     
     # Initialize database
     await init_database()
     
-    # Start background tasks
-    check_signals.start()
-    print('🔄 Signal detection loop started')
+    # Start background tasks (on_ready fires again on reconnect; keep what's running)
+    if not check_signals.is_running():
+        await get_alert_state().load()  # In-memory state is current after the first load
+        check_signals.start()
+        print('🔄 Signal detection loop started')
+    if not maintain_database.is_running():
+        maintain_database.start()
+    
+    # Load the sentiment model in the background; items scanned before it's up keep NEUTRAL sentiment
+    asyncio.create_task(warm_up_sentiment())
+
+async def warm_up_sentiment():
+    """Load FinBERT off the startup path and log when it is ready"""
+    task = warm_up()
+    if task is None:
+        return  # Already started (on_ready fires again on reconnect)
+    
+    loaded = await task
+    elapsed = time.monotonic() - STARTED_AT
+    if loaded:
+        print(f'🧠 Sentiment model ready {elapsed:.1f}s after start')
+    else:
+        print(f'⚠️  Sentiment model failed to load ({elapsed:.1f}s after start); sentiment stays NEUTRAL')
 
 @bot.command()
 async def ping(ctx):
@@ -55,7 +102,7 @@ async def ping(ctx):
 @bot.command()
 async def status(ctx):
     """Show bot status and statistics"""
-    alerts_today = await get_alerts_today()
+    alerts_today = get_alert_state().sent_today()
     
     embed = discord.Embed(
         title="📊 Bot Status",
@@ -63,6 +110,21 @@ async def status(ctx):
     )
     embed.add_field(name="Alerts Today", value=f"{alerts_today}/{MAX_ALERTS_PER_DAY}", inline=True)
     embed.add_field(name="Status", value="🟢 Active", inline=True)
+    
+    http_totals = get_http_client().summary()
+    embed.add_field(
+        name="HTTP Requests",
+        value=f"{http_totals['requests']} ({http_totals['retries']} retries, {http_totals['errors']} errors)",
+        inline=True
+    )
+    worker = get_sentiment_worker()
+    embed.add_field(
+        name="Sentiment Worker",
+        value=f"{worker.stats['batches']} batches, max {worker.stats['max_batch']} "
+              f"(queue {worker.queue.qsize()}, {worker.stats['restarts']} restarts)",
+        inline=True
+    )
+    embed.add_field(name="Dedup Filter", value=get_content_filter().summary(), inline=False)
     embed.add_field(
         name="Monitoring",
         value=f"SEC Filings, News Feeds, Economic Data, Earnings",
@@ -92,6 +154,76 @@ async def watchlist(ctx):
     
     await ctx.send(embed=embed)
 
+async def fetch_source(name, fetch, items, timeout):
+    """
+    Run one ingestor under its own deadline, collecting into `items`
+    Returns: 'ok', 'partial' (timed out) or 'error'
+    """
+    try:
+        await asyncio.wait_for(fetch(results=items), timeout=timeout)
+        return 'ok'
+    except asyncio.TimeoutError:
+        return 'partial'
+    except Exception as e:
+        print(f"  ❌ {name} ingestor failed: {e}")
+        return 'error'
+
+async def collect_sources():
+    """
+    Fetch all sources concurrently, bounded by per-source and scan deadlines
+    Returns: (content items, watermarks to commit once they are processed)
+    Sources that time out or fail keep their old watermark, so whatever they
+    did not reach is fetched again next scan.
+    """
+    sources = {
+        'SEC': (partial(sec_ingestor.get_recent_filings, hours=24), 'filings'),
+        'News': (partial(rss_ingestor.get_recent_news, hours=24), 'news items'),
+        'FRED': (partial(fred_ingestor.get_recent_data, hours=24), 'data points'),
+        'Earnings': (yahoo_ingestor.get_earnings_data, 'earnings events'),
+    }
+    
+    print(f"  📡 Fetching {', '.join(sources)} concurrently...")
+    
+    # Only items newer than each source's watermark come back; the 24h
+    # window is just the backfill for feeds seen for the first time
+    watermarks = {name: await Watermarks.load(name) for name in sources}
+    
+    # Ingestors append into these lists as they go, so whatever arrived
+    # before a deadline is kept even when the task is cancelled
+    buffers = {name: [] for name in sources}
+    fetch_tasks = {
+        name: asyncio.create_task(
+            fetch_source(
+                name,
+                partial(fetch, watermarks=watermarks[name]),
+                buffers[name],
+                SOURCE_TIMEOUTS.get(name, SCAN_TIMEOUT)
+            )
+        )
+        for name, (fetch, _) in sources.items()
+    }
+    
+    done, pending = await asyncio.wait(fetch_tasks.values(), timeout=SCAN_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    
+    all_content = []
+    completed = []
+    for name, task in fetch_tasks.items():
+        status = task.result() if task in done else 'partial'
+        items = buffers[name]
+        all_content.extend(items)
+        if status == 'ok':
+            completed.append(watermarks[name])
+        
+        suffix = '' if status == 'ok' else f' ({status})'
+        print(f"     {name}: {len(items)} {sources[name][1]}{suffix}")
+    
+    for host, stats in get_http_client().stats.items():
+        print(f"     🌐 {host}: {stats['requests']} requests, {stats['retries']} retries, {stats['errors']} errors")
+    
+    return all_content, completed
+
 @tasks.loop(minutes=15)
 async def check_signals():
     """Main signal detection loop - runs every 15 minutes"""
@@ -104,76 +236,76 @@ async def check_signals():
     
     try:
         # Check if we've hit daily limit
-        alerts_today = await get_alerts_today()
-        if alerts_today >= MAX_ALERTS_PER_DAY:
-            print(f"⚠️  Daily alert limit reached ({alerts_today}/{MAX_ALERTS_PER_DAY})")
+        alert_state = get_alert_state()
+        if alert_state.remaining_today() == 0:
+            print(f"⚠️  Daily alert limit reached ({alert_state.sent_today()}/{MAX_ALERTS_PER_DAY})")
             return
         
-        # Collect data from all sources
-        all_content = []
+        writes_start = get_writer().stats.copy()
+        
+        # Collect data from all sources concurrently
+        all_content, watermarks = await collect_sources()
         
-        print("  📄 Fetching SEC filings...")
-        sec_content = await sec_ingestor.get_recent_filings(hours=24)
-        all_content.extend(sec_content)
-        print(f"     Found {len(sec_content)} filings")
+        print(f"\n  📥 Total content items: {len(all_content)}")
         
-        print("  📰 Fetching news feeds...")
-        news_content = await rss_ingestor.get_recent_news(hours=24)
-        all_content.extend(news_content)
-        print(f"     Found {len(news_content)} news items")
+        # Validate the whole scan (one duplicate lookup, one bulk insert)
+        validation_start = validator.stats.copy()
+        results = await validator.validate_many(all_content)
+        valid_content = [content for content, (is_valid, _) in zip(all_content, results) if is_valid]
         
-        print("  📊 Fetching economic data...")
-        fred_content = await fred_ingestor.get_recent_data(hours=24)
-        all_content.extend(fred_content)
-        print(f"     Found {len(fred_content)} data points")
+        # Drop reworded copies of the same story, keeping the most trusted source
+        near_dup_start = get_near_duplicate_filter().stats['near_duplicates']
+        valid_content = get_near_duplicate_filter().filter(valid_content)
+        near_duplicates = get_near_duplicate_filter().stats['near_duplicates'] - near_dup_start
         
-        print("  💰 Fetching earnings data...")
-        earnings_content = await yahoo_ingestor.get_earnings_data()
-        all_content.extend(earnings_content)
-        print(f"     Found {len(earnings_content)} earnings events")
+        # Detect signals (sentiment runs batched over the survivors)
+        signals_detected = await detector.detect_many(valid_content)
         
-        print(f"\n  📥 Total content items: {len(all_content)}")
+        # One composite signal per event (same ticker, event family and window)
+        signals_clustered = cluster_signals(signals_detected)
         
-        # Process each item
-        signals_detected = []
-        for content in all_content:
-            # Validate content
-            is_valid, reason = await validator.is_valid(content)
-            if not is_valid:
-                continue
-            
-            # Detect signal
-            signal = await detector.detect(content)
-            if signal:
-                signals_detected.append(signal)
+        # Everything fetched has been processed; advance the watermarks
+        for marks in watermarks:
+            await marks.commit()
+        
+        validation = validator.stats - validation_start
+        rejections = ', '.join(
+            f"{stage} {count}" for stage, count in validation.most_common()
+            if stage not in ('checked', 'valid')
+        )
+        print(f"  🧹 Valid: {validation['valid']}/{validation['checked']}"
+              + (f" (rejected: {rejections})" if rejections else '')
+              + (f", {near_duplicates} near-duplicates dropped" if near_duplicates else ''))
+        print(f"  ✅ Signals detected: {len(signals_detected)}"
+              + (f" ({len(signals_clustered)} events)" if len(signals_clustered) < len(signals_detected) else ''))
+        print(f"  🧮 Dedup filter: {get_content_filter().summary()}")
+        
+        sentiment_stats = get_sentiment_worker().stats
+        if sentiment_stats['batches']:
+            print(f"  🧠 Sentiment worker: {sentiment_stats['requests']} items in {sentiment_stats['batches']} batches "
+                  f"(max batch {sentiment_stats['max_batch']}, max queue {sentiment_stats['max_queue_depth']}, "
+                  f"{sentiment_stats['restarts']} restarts)")
         
-        print(f"  ✅ Signals detected: {len(signals_detected)}")
+        cache_stats = get_sentiment_cache().stats
+        print(f"  💾 Sentiment cache: {cache_stats['memory_hits']} memory hits, "
+              f"{cache_stats['db_hits']} db hits, {cache_stats['misses']} misses")
         
-        # Sort by confidence and send top signals
-        signals_detected.sort(key=lambda x: x['confidence'], reverse=True)
+        # Best signal per ticker, off cooldown, top of what today's quota allows
+        selection_start = alert_state.stats.copy()
+        candidates = alert_state.select(signals_clustered)
+        selection = alert_state.stats - selection_start
+        if selection:
+            print(f"  ⏳ Skipped {selection['collapsed']} same-ticker duplicates, "
+                  f"{selection['cooldown']} tickers on cooldown")
         
         alerts_sent = 0
-        for signal in signals_detected:
-            # Check cooldown
-            if await is_on_cooldown(signal['ticker'], hours=COOLDOWN_HOURS):
-                print(f"  ⏳ Skipping {signal['ticker']} (cooldown)")
-                continue
-            
-            # Check daily limit
-            if alerts_today + alerts_sent >= MAX_ALERTS_PER_DAY:
-                print(f"  ⚠️  Daily limit reached, stopping")
-                break
-            
-            # Save signal to database
-            signal_id = await save_signal(signal)
-            
+        for signal in candidates:
             # Send alert
             embed = formatter.format_signal(signal)
             await channel.send(embed=embed)
             
-            # Update tracking
-            await update_cooldown(signal['ticker'])
-            await log_alert(signal_id, signal['ticker'])
+            # Update cooldown and quota; signal, cooldown and alert log commit together
+            await alert_state.record(signal)
             
             alerts_sent += 1
             print(f"  📢 Alert sent: {signal['ticker']} - {signal['signal_type']}")
@@ -181,6 +313,13 @@ async def check_signals():
             # Rate limit (1 alert per 5 seconds)
             await asyncio.sleep(5)
         
+        # Scan's writes are committed before reporting them
+        await get_writer().flush()
+        writes = get_writer().stats - writes_start
+        if writes['writes']:
+            print(f"  💾 DB: {writes['writes']} writes, {writes['rows']} rows in {writes['commits']} commits "
+                  f"({writes['rows'] / writes['writes']:.1f} rows/write, {writes['failed']} failed)")
+        
         print(f"\n✅ Scan complete. Sent {alerts_sent} alerts.\n")
         
     except Exception as e:
@@ -195,6 +334,23 @@ async def before_check_signals():
     print("⏳ Waiting 30 seconds before first scan...")
     await asyncio.sleep(30)
 
+@tasks.loop(hours=DB_MAINTENANCE_HOURS)
+async def maintain_database():
+    """Prune expired rows, reclaim free pages and refresh planner statistics"""
+    try:
+        started = time.monotonic()
+        deleted = await run_retention()
+        pruned = ', '.join(f"{table} {count}" for table, count in deleted.items())
+        print(f"🗑️  Database maintenance: pruned {pruned} in {time.monotonic() - started:.1f}s")
+    except Exception as e:
+        print(f"❌ Error in database maintenance: {e}")
+
+@maintain_database.before_loop
+async def before_maintain_database():
+    """First run an hour after startup, away from the first scans"""
+    await bot.wait_until_ready()
+    await asyncio.sleep(3600)
+
 # Error handling
 @bot.event
 async def on_command_error(ctx, error):
@@ -217,6 +373,10 @@ if __name__ == "__main__":
     
     print("🚀 Starting Market Intelligence Bot...")
     
+    if STARTUP_IMPORT_REPORT:
+        from import_time import measure_imports, format_report
+        print(format_report(*measure_imports(runs=1)))
+    
     # Start keep-alive server for Replit (optional - only if using Replit)
     try:
         from keep_alive import keep_alive
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from config.settings import EVENT_FAMILIES, CLUSTER_WINDOW_HOURS
+
+def _event_time(signal):
+    """Signal timestamp as epoch seconds (naive datetimes are taken as UTC)"""
+    timestamp = signal.get('timestamp')
+    if not isinstance(timestamp, datetime):
+        return datetime.now(timezone.utc).timestamp()
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+def combined_confidence(confidences):
+    """
+    Noisy-OR: the chance at least one independent report is right
+    Two 0.7 signals give 0.91; one signal keeps its own confidence.
+    """
+    doubt = 1.0
+    for confidence in confidences:
+        doubt *= 1 - confidence
+    return 1 - doubt
+
+def _composite(members):
+    """One signal for a cluster: the strongest member, with every source listed"""
+    members = sorted(members, key=lambda signal: signal['confidence'], reverse=True)
+    composite = dict(members[0])
+    composite['confidence'] = combined_confidence(signal['confidence'] for signal in members)
+    composite['sources'] = [
+        {
+            'source': signal.get('source', ''),
+            'signal_type': signal['signal_type'],
+            'headline': signal['headline'],
+            'url': signal.get('source_url', '')
+        }
+        for signal in members
+    ]
+    return composite
+
+def cluster_signals(signals, window_hours=CLUSTER_WINDOW_HOURS):
+    """
+    Merge signals about the same event into composite signals
+    Signals share an event when they have the same ticker and event family
+    (EVENT_FAMILIES: an 8-K, a press release and a news item about one
+    deal are all a corporate event) and fall within window_hours of the
+    cluster's first signal.
+    Returns: list of signals, each with 'sources'
+    """
+    groups = {}
+    for signal in signals:
+        family = EVENT_FAMILIES.get(signal['signal_type'], signal['signal_type'])
+        groups.setdefault((signal['ticker'], family), []).append(signal)
+    
+    window = window_hours * 3600
+    clustered = []
+    for members in groups.values():
+        members.sort(key=_event_time)
+        cluster = [members[0]]
+        for signal in members[1:]:
+            if _event_time(signal) - _event_time(cluster[0]) <= window:
+                cluster.append(signal)
+            else:
+                clustered.append(_composite(cluster))
+                cluster = [signal]
+        clustered.append(_composite(cluster))
+    
+    return clustered
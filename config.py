@@ -28,6 +28,71 @@ MIN_CONFIDENCE = 0.80
 MAX_ALERTS_PER_DAY = 10
 COOLDOWN_HOURS = 4
 
+# Event clustering: signal types that can describe the same corporate event
+EVENT_FAMILIES = {
+    'sec_filing': 'corporate_event',
+    'ma_activity': 'corporate_event',
+    'management_change': 'corporate_event',
+    'product_launch': 'corporate_event',
+    'regulatory': 'corporate_event',
+    'insider_trade': 'insider_trade',
+    'earnings': 'earnings',
+    'earnings_preview': 'earnings',
+    'macro_data': 'macro_data'
+}
+CLUSTER_WINDOW_HOURS = 6
+
+# Scan Deadlines (seconds)
+SOURCE_TIMEOUTS = {
+    'SEC': 60,
+    'News': 90,
+    'FRED': 60,
+    'Earnings': 120
+}
+SCAN_TIMEOUT = 180  # Hard cap for fetching all sources
+
+# HTTP Client
+HTTP_TIMEOUT = 15             # Seconds per request
+HTTP_MAX_RETRIES = 3          # Retries on connection errors, 429 and 5xx
+HTTP_POOL_PER_HOST = 4        # Keep-alive connections per host
+HTTP_RATE_LIMITS = {          # Requests per second, per host
+    'www.sec.gov': 10,        # SEC fair-access cap
+    'news.google.com': 2,
+}
+HTTP_DEFAULT_RATE_LIMIT = 5
+
+# SEC Ingestion
+# 'per_ticker': one 8-K and one Form 4 feed per watched CIK (2×N requests)
+# 'latest': page EDGAR's global current-filings feed and filter locally
+SEC_INGEST_MODE = os.getenv('SEC_INGEST_MODE', 'per_ticker')
+SEC_LATEST_MAX_PAGES = 10     # 100 filings per page
+
+# Feed Ingestion
+RSS_MAX_CONCURRENCY = 8       # Feeds downloaded at once
+FEED_PARSE_WORKERS = 4        # Threads parsing feed documents
+FEED_PARSER_BACKEND = 'fast'  # 'fast' (lxml streaming) or 'feedparser'
+
+# Google News
+# Batch mode packs several tickers into one OR query and rotates batches
+# across scans, so the whole watchlist is covered every few scans
+GOOGLE_NEWS_BATCH_MODE = True
+GOOGLE_NEWS_MAX_QUERY_LENGTH = 200   # Characters, before URL encoding
+GOOGLE_NEWS_BATCHES_PER_SCAN = 3
+
+# Sentiment (FinBERT)
+SENTIMENT_MODEL = 'ProsusAI/finbert'
+SENTIMENT_BACKEND = os.getenv('SENTIMENT_BACKEND', 'transformers')  # or 'onnx' (int8, see processing.sentiment_onnx)
+SENTIMENT_ONNX_DIR = 'models/finbert-onnx'
+SENTIMENT_BATCH_SIZE = 16     # Texts per forward pass
+SENTIMENT_MAX_TOKENS = 512    # Model limit; longer texts are truncated by the tokenizer
+SENTIMENT_WORKER = True       # Run inference in a separate process
+SENTIMENT_WORKER_THREADS = 2  # Torch threads in the worker
+SENTIMENT_BATCH_WINDOW = 0.05 # Seconds to gather requests into one batch
+SENTIMENT_WORKER_MAX_BATCH = 128
+SENTIMENT_WORKER_TIMEOUT = 300  # Seconds per batch (includes the first model load)
+SENTIMENT_CACHE_SIZE = 5000   # Results kept in memory (LRU)
+SENTIMENT_CACHE_TTL_HOURS = 72  # Memory and SQLite tiers
+
 # Trusted Sources
 TRUSTED_SOURCES = [
     'SEC',
@@ -38,6 +103,22 @@ TRUSTED_SOURCES = [
     'Yahoo Finance'
 ]
 
+# Most trusted first; decides which copy of a reworded story is kept
+SOURCE_TRUST = [
+    'SEC',
+    'Company IR',
+    'Federal Reserve',
+    'FRED',
+    'Reuters',
+    'Yahoo Finance',
+    'Google News'
+]
+
+# Near-duplicate detection (SimHash)
+NEAR_DUP_MAX_DISTANCE = 7      # Differing bits (of 64) still counted as the same story
+NEAR_DUP_BANDS = 8             # Must exceed NEAR_DUP_MAX_DISTANCE
+NEAR_DUP_WINDOW_HOURS = 48
+
 # Sponsored Content Keywords (for filtering)
 SPONSORED_KEYWORDS = [
     'sponsored', 'paid promotion', 'partnered content',
@@ -53,7 +134,31 @@ OPINION_URL_PATTERNS = [
 
 # Database
 DB_PATH = 'data/market_intel.db'
+DB_CACHE_SIZE_KB = 16000      # SQLite page cache
+DB_MMAP_SIZE = 64 * 1024 * 1024
+DB_CACHED_STATEMENTS = 256     # Prepared statements kept per connection
+DB_WRITE_WINDOW = 0.05         # Seconds a write waits for others to share its commit
+DB_WRITE_MAX_BATCH = 500       # Writes per group commit
+
+# Content dedup (Bloom filter in front of content_cache)
+CONTENT_DEDUP_DAYS = 14        # Window a repeated story is suppressed for
+BLOOM_ITEMS_PER_DAY = 20000    # Expected new content hashes per day
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+BLOOM_MAX_BYTES = 4 * 1024 * 1024  # Cap across all daily filters
+
+# Retention (pruned by the maintenance task)
+RETENTION_DAYS = {
+    'alert_history': 90,
+    'signals': 180,
+    'content_cache': 30,          # Keep longer than CONTENT_DEDUP_DAYS
+}
+DB_MAINTENANCE_HOURS = 24
+DB_VACUUM_PAGES = 2000         # Free pages returned per run (incremental VACUUM)
 
 # Logging
 LOG_LEVEL = 'INFO'
-LOG_FILE = 'logs/bot.log'
\ No newline at end of file
+LOG_FILE = 'logs/bot.log'
+
+# Startup
+IMPORT_TIME_BUDGET_MS = 1500  # `python import_time.py --check` fails above this
+STARTUP_IMPORT_REPORT = os.getenv('STARTUP_IMPORT_REPORT', '') == '1'  # Print import costs at launch
\ No newline at end of file
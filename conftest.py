@@ -0,0 +1,17 @@
+import asyncio
+import pytest_asyncio
+import database.bloom as bloom
+import database.models as models
+
+@pytest_asyncio.fixture
+async def fresh_db(tmp_path, monkeypatch):
+    """Empty database in a temp dir, with the module singletons reset"""
+    monkeypatch.setattr(models, 'DB_PATH', str(tmp_path / 'market_intel.db'))
+    monkeypatch.setattr(models, 'db_connection', None)
+    monkeypatch.setattr(models, 'db_open_lock', asyncio.Lock())
+    monkeypatch.setattr(models, 'db_initialized', False)
+    monkeypatch.setattr(models, 'db_init_lock', asyncio.Lock())
+    monkeypatch.setattr(models, 'db_writer', None)
+    monkeypatch.setattr(bloom, 'content_filter', None)
+    yield models
+    await models.close_database()
@@ -1,13 +1,194 @@
 import aiosqlite
+import asyncio
+import json
 import os
-from datetime import datetime
-from config.settings import DB_PATH
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, date
+from config.settings import (
+    DB_PATH, DB_CACHE_SIZE_KB, DB_MMAP_SIZE, DB_CACHED_STATEMENTS,
+    DB_WRITE_WINDOW, DB_WRITE_MAX_BATCH, CONTENT_DEDUP_DAYS,
+    RETENTION_DAYS, DB_VACUUM_PAGES
+)
+from database.bloom import get_content_filter
+
+# Long-lived connection, opened by init_database() and closed on shutdown
+db_connection = None
+db_open_lock = asyncio.Lock()  # First callers wait for one open instead of each connecting
+
+# Schema and content filter set up (on_ready re-runs init_database on every reconnect)
+db_initialized = False
+db_init_lock = asyncio.Lock()
+
+async def get_db():
+    """Get the shared connection, opening and tuning it on first use"""
+    global db_connection
+    if db_connection is None:
+        async with db_open_lock:
+            if db_connection is None:
+                db = await aiosqlite.connect(DB_PATH, cached_statements=DB_CACHED_STATEMENTS)
+                await db.execute('PRAGMA journal_mode=WAL')  # Readers don't block the writer
+                await db.execute('PRAGMA synchronous=NORMAL')  # Safe under WAL; no fsync per commit
+                await db.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KB}')
+                await db.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}')
+                await db.execute('PRAGMA temp_store=MEMORY')
+                await db.execute('PRAGMA busy_timeout=5000')
+                db_connection = db
+    return db_connection
+
+@asynccontextmanager
+async def connection():
+    """Borrow the shared connection (it stays open after the block)"""
+    yield await get_db()
+
+class DatabaseWriter:
+    """
+    Single writer task that group-commits queued writes
+    Writes arriving within DB_WRITE_WINDOW share one transaction (one
+    fsync); each runs in its own savepoint, so a failing write is rolled
+    back alone and a multi-statement write stays atomic.
+    """
+    
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.stats = Counter()
+        self.pending_hashes = set()  # Content hashes queued but not yet committed
+        self._task = None
+    
+    def submit(self, write):
+        """
+        Queue `write(db)` (a coroutine function) for the next group commit
+        Returns: future with its result, resolved once committed
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((write, future))
+        return future
+    
+    async def flush(self):
+        """Barrier: wait until everything queued so far is committed"""
+        await self.submit(None)
+    
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(DB_WRITE_WINDOW)
+            while len(batch) < DB_WRITE_MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            try:
+                await self._commit_group(batch)
+            except Exception as e:
+                # Never let one bad group stop the writer; fail its waiters instead
+                print(f"❌ Database writer error: {e}")
+                for _, future in batch:
+                    self._resolve(future, error=e)
+    
+    @staticmethod
+    def _resolve(future, result=None, error=None):
+        """Deliver an outcome unless the waiter already gave up (cancelled future)"""
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    async def _commit_group(self, batch):
+        if all(write is None for write, _ in batch):  # Only flush() barriers
+            for _, future in batch:
+                self._resolve(future)
+            return
+        
+        db = await get_db()
+        changes_before = db.total_changes
+        outcomes = []
+        
+        try:
+            await db.execute('BEGIN')
+            for write, future in batch:
+                if write is None:  # flush() barrier
+                    outcomes.append((future, None, None))
+                    continue
+                
+                await db.execute('SAVEPOINT write')
+                try:
+                    result = await write(db)
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    print(f"❌ Database write failed: {e}")
+                    await db.execute('ROLLBACK TO write')
+                    outcomes.append((future, None, e))
+                await db.execute('RELEASE write')
+            
+            await db.commit()
+            self.stats['commits'] += 1
+        except Exception as e:
+            print(f"❌ Database group commit failed: {e}")
+            if db.in_transaction:
+                await db.rollback()
+            outcomes = [(future, None, e) for _, future in batch]
+        
+        self.stats['writes'] += sum(1 for write, _ in batch if write is not None)
+        self.stats['rows'] += db.total_changes - changes_before
+        
+        for future, result, error in outcomes:
+            if error is not None:
+                self.stats['failed'] += 1
+            self._resolve(future, result, error)
+    
+    async def close(self):
+        """Commit everything still queued, then stop"""
+        if self._task is not None and not self._task.done():
+            await self.flush()
+            self._task.cancel()
+
+# Global writer (every database write goes through it)
+db_writer = None
+
+def get_writer():
+    """Get or create database writer singleton"""
+    global db_writer
+    if db_writer is None:
+        db_writer = DatabaseWriter()
+    return db_writer
+
+def _ignore_result(future):
+    """Done callback for fire-and-forget writes (the writer logs failures)"""
+    if not future.cancelled():
+        future.exception()
+
+async def close_database():
+    """Flush queued writes, then checkpoint and close the shared connection"""
+    global db_connection
+    if db_writer is not None:
+        await db_writer.close()
+    if db_connection is not None:
+        await db_connection.execute('PRAGMA optimize')
+        await db_connection.close()
+        db_connection = None
 
 async def init_database():
-    """Initialize SQLite database with schema"""
+    """
+    Initialize SQLite database with schema, once per process
+    The DDL and migrations commit on the shared connection, so they must
+    run before the writer starts its group transactions; later calls
+    (on_ready after a reconnect) return at once.
+    """
+    global db_initialized
+    async with db_init_lock:
+        if db_initialized:
+            return
+        await _create_schema()
+        await load_content_filter()
+        db_initialized = True
+
+async def _create_schema():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with connection() as db:
         # Signals table
         await db.execute('''
             CREATE TABLE IF NOT EXISTS signals (
@@ -55,84 +236,407 @@ async def init_database():
             )
         ''')
         
+        # Feed polling state (high-water mark + HTTP validators per feed)
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS feed_state (
+                feed_key TEXT PRIMARY KEY,
+                last_entry_id TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Scan watermarks (newest published time + entry IDs at that time, per feed)
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source TEXT NOT NULL,
+                feed TEXT NOT NULL,
+                last_published DATETIME NOT NULL,
+                seen_ids TEXT NOT NULL,
+                PRIMARY KEY (source, feed)
+            )
+        ''')
+        
+        # Sentiment results (keyed by normalized-text hash and model)
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                text_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                label TEXT NOT NULL,
+                score REAL NOT NULL,
+                created_at DATETIME NOT NULL,
+                PRIMARY KEY (text_hash, model_id)
+            )
+        ''')
+        
         await db.commit()
+        await migrate(db)
         print("✅ Database initialized")
 
+# Schema migrations, applied in order; PRAGMA user_version counts those applied
+MIGRATIONS = [
+    # 1: Indexes for time-range and per-ticker queries
+    '''
+        BEGIN;
+        CREATE INDEX IF NOT EXISTS idx_alert_history_timestamp ON alert_history (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_alert_history_ticker ON alert_history (ticker, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_signals_created_at ON signals (created_at);
+        CREATE INDEX IF NOT EXISTS idx_signals_ticker ON signals (ticker, created_at);
+        CREATE INDEX IF NOT EXISTS idx_content_cache_created_at ON content_cache (created_at);
+        CREATE INDEX IF NOT EXISTS idx_sentiment_cache_created_at ON sentiment_cache (created_at);
+        COMMIT;
+    ''',
+    # 2: Let retention hand pages back with incremental_vacuum (takes effect after one VACUUM)
+    '''
+        PRAGMA auto_vacuum = INCREMENTAL;
+        VACUUM;
+    ''',
+]
+
+async def migrate(db):
+    """
+    Apply any migrations newer than the database's user_version
+    executescript() commits, so this only runs from init_database()
+    """
+    async with db.execute('PRAGMA user_version') as cursor:
+        version = (await cursor.fetchone())[0]
+    
+    for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+        await db.executescript(f"{script}\nPRAGMA user_version = {number};")
+        print(f"🔧 Applied database migration {number}")
+
+# Content counts as seen if cached within CONTENT_DEDUP_DAYS; the Bloom
+# filter load and the exact check must agree on this window
+DEDUP_WINDOW_SQL = "created_at > datetime('now', '-' || ? || ' days')"
+
+async def load_content_filter():
+    """Rebuild the in-memory dedup filter from the last CONTENT_DEDUP_DAYS of content_cache"""
+    content_filter = get_content_filter()
+    async with connection() as db:
+        async with db.execute(f'''
+            SELECT content_hash, date(created_at) FROM content_cache
+            WHERE {DEDUP_WINDOW_SQL}
+        ''', (CONTENT_DEDUP_DAYS,)) as cursor:
+            async for content_hash, day in cursor:
+                content_filter.add(content_hash, date.fromisoformat(day))
+    content_filter.loaded = True
+    print(f"✅ Dedup filter loaded: {content_filter.summary()}")
+
+async def _insert_signal(db, signal_data):
+    """Insert a signal row; returns its id"""
+    cursor = await db.execute('''
+        INSERT INTO signals 
+        (ticker, signal_type, category, headline, details, confidence, timestamp, source_url, is_opinion)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        signal_data['ticker'],
+        signal_data['signal_type'],
+        signal_data['category'],
+        signal_data['headline'],
+        signal_data['details'],
+        signal_data['confidence'],
+        signal_data['timestamp'],
+        signal_data['source_url'],
+        signal_data.get('is_opinion', False)
+    ))
+    return cursor.lastrowid
+
 async def save_signal(signal_data):
     """Save detected signal to database"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute('''
-            INSERT INTO signals 
-            (ticker, signal_type, category, headline, details, confidence, timestamp, source_url, is_opinion)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            signal_data['ticker'],
-            signal_data['signal_type'],
-            signal_data['category'],
-            signal_data['headline'],
-            signal_data['details'],
-            signal_data['confidence'],
-            signal_data['timestamp'],
-            signal_data['source_url'],
-            signal_data.get('is_opinion', False)
-        ))
-        await db.commit()
-        return db.lastrowid
+    async def write(db):
+        return await _insert_signal(db, signal_data)
+    return await get_writer().submit(write)
 
 async def is_duplicate(content_hash):
-    """Check if content has been seen before"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute(
-            'SELECT 1 FROM content_cache WHERE content_hash = ?',
-            (content_hash,)
-        ) as cursor:
-            result = await cursor.fetchone()
-            return result is not None
+    """Check if content has been seen before (including writes not yet committed)"""
+    return content_hash in await find_duplicates([content_hash])
+
+async def find_duplicates(content_hashes):
+    """
+    Which of these content hashes have been seen in the last
+    CONTENT_DEDUP_DAYS (writes not yet committed included)
+    Definite misses in the Bloom filter skip SQLite; the rest are checked
+    exactly, one query per SQL_PARAM_CHUNK hashes.
+    Returns: set of seen hashes
+    """
+    content_hashes = list(set(content_hashes))
+    seen = set()
+    if db_writer is not None:
+        seen.update(db_writer.pending_hashes.intersection(content_hashes))
+    
+    unknown = [content_hash for content_hash in content_hashes if content_hash not in seen]
+    content_filter = get_content_filter()
+    if content_filter.loaded:
+        unknown = [content_hash for content_hash in unknown if content_filter.might_contain(content_hash)]
+    
+    found = set()
+    async with connection() as db:
+        for start in range(0, len(unknown), SQL_PARAM_CHUNK):
+            chunk = unknown[start:start + SQL_PARAM_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            async with db.execute(
+                f'SELECT content_hash FROM content_cache WHERE content_hash IN ({placeholders}) AND {DEDUP_WINDOW_SQL}',
+                (*chunk, CONTENT_DEDUP_DAYS)
+            ) as cursor:
+                found.update(row[0] for row in await cursor.fetchall())
+    
+    if content_filter.loaded:
+        content_filter.record_false_positive(len(unknown) - len(found))
+    return seen | found
 
 async def cache_content(content_hash, ticker, source):
     """Cache content hash to prevent duplicates"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute('''
-            INSERT OR IGNORE INTO content_cache (content_hash, ticker, source)
+    await cache_contents([(content_hash, ticker, source)])
+
+async def cache_contents(rows):
+    """
+    Cache many (content_hash, ticker, source) rows in one executemany
+    Queued without waiting for the commit; find_duplicates() sees them at once.
+    A hash seen again after the dedup window restarts its window.
+    """
+    if not rows:
+        return
+    async def write(db):
+        await db.executemany('''
+            INSERT INTO content_cache (content_hash, ticker, source)
             VALUES (?, ?, ?)
-        ''', (content_hash, ticker, source))
-        await db.commit()
+            ON CONFLICT(content_hash) DO UPDATE SET created_at = CURRENT_TIMESTAMP
+        ''', rows)
+    
+    content_filter = get_content_filter()
+    for row in rows:
+        content_filter.add(row[0])
+    
+    writer = get_writer()
+    hashes = {row[0] for row in rows}
+    writer.pending_hashes.update(hashes)
+    future = writer.submit(write)
+    future.add_done_callback(lambda _: writer.pending_hashes.difference_update(hashes))
+    future.add_done_callback(_ignore_result)
+
+# Hot queries compare the bare column against a constant, so they can use an index
+ALERTS_TODAY_SQL = '''
+    SELECT COUNT(*) FROM alert_history
+    WHERE timestamp >= date('now')
+'''
+
+COOLDOWN_SQL = '''
+    SELECT last_alert FROM ticker_cooldowns
+    WHERE ticker = ?
+    AND last_alert > datetime('now', '-' || ? || ' hours')
+'''
 
 async def is_on_cooldown(ticker, hours=4):
     """Check if ticker is on cooldown (prevent spam)"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute('''
-            SELECT last_alert FROM ticker_cooldowns
-            WHERE ticker = ?
-            AND datetime(last_alert, '+' || ? || ' hours') > datetime('now')
-        ''', (ticker, hours)) as cursor:
+    async with connection() as db:
+        async with db.execute(COOLDOWN_SQL, (ticker, hours)) as cursor:
             result = await cursor.fetchone()
             return result is not None
 
+async def get_cooldowns(hours=4):
+    """Get tickers still on cooldown: {ticker: last_alert}"""
+    async with connection() as db:
+        async with db.execute('''
+            SELECT ticker, last_alert FROM ticker_cooldowns
+            WHERE last_alert > datetime('now', '-' || ? || ' hours')
+        ''', (hours,)) as cursor:
+            return dict(await cursor.fetchall())
+
+async def _touch_cooldown(db, ticker):
+    await db.execute('''
+        INSERT OR REPLACE INTO ticker_cooldowns (ticker, last_alert)
+        VALUES (?, datetime('now'))
+    ''', (ticker,))
+
 async def update_cooldown(ticker):
     """Update cooldown timestamp for ticker"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute('''
-            INSERT OR REPLACE INTO ticker_cooldowns (ticker, last_alert)
-            VALUES (?, datetime('now'))
-        ''', (ticker,))
-        await db.commit()
+    async def write(db):
+        await _touch_cooldown(db, ticker)
+    await get_writer().submit(write)
 
 async def get_alerts_today():
     """Get number of alerts sent today"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute('''
-            SELECT COUNT(*) FROM alert_history
-            WHERE date(timestamp) = date('now')
-        ''') as cursor:
+    async with connection() as db:
+        async with db.execute(ALERTS_TODAY_SQL) as cursor:
             result = await cursor.fetchone()
             return result[0] if result else 0
 
+async def _insert_alert(db, signal_id, ticker):
+    await db.execute('''
+        INSERT INTO alert_history (signal_id, ticker, timestamp)
+        VALUES (?, ?, datetime('now'))
+    ''', (signal_id, ticker))
+
 async def log_alert(signal_id, ticker):
     """Log that we sent an alert"""
-    async with aiosqlite.connect(DB_PATH) as db:
+    async def write(db):
+        await _insert_alert(db, signal_id, ticker)
+    await get_writer().submit(write)
+
+async def record_alert(signal_data):
+    """
+    Record a sent alert atomically: the signal, the ticker's cooldown and
+    the alert-history row commit together or not at all
+    Returns: signal id
+    """
+    async def write(db):
+        signal_id = await _insert_signal(db, signal_data)
+        await _touch_cooldown(db, signal_data['ticker'])
+        await _insert_alert(db, signal_id, signal_data['ticker'])
+        return signal_id
+    return await get_writer().submit(write)
+
+async def get_feed_state(feed_key):
+    """Get last-seen entry and HTTP validators for a feed"""
+    async with connection() as db:
+        async with db.execute('''
+            SELECT last_entry_id, etag, last_modified FROM feed_state
+            WHERE feed_key = ?
+        ''', (feed_key,)) as cursor:
+            result = await cursor.fetchone()
+            if result is None:
+                return {}
+            return {
+                'last_entry_id': result[0],
+                'etag': result[1],
+                'last_modified': result[2]
+            }
+
+async def save_feed_state(feed_key, last_entry_id, etag, last_modified):
+    """Record the newest entry and HTTP validators seen for a feed"""
+    async def write(db):
+        await db.execute('''
+            INSERT OR REPLACE INTO feed_state (feed_key, last_entry_id, etag, last_modified, updated_at)
+            VALUES (?, ?, ?, ?, datetime('now'))
+        ''', (feed_key, last_entry_id, etag, last_modified))
+    await get_writer().submit(write)
+
+async def get_watermarks(source):
+    """Get watermarks for every feed of a source: {feed: (last_published, seen_ids)}"""
+    async with connection() as db:
+        async with db.execute('''
+            SELECT feed, last_published, seen_ids FROM source_watermarks
+            WHERE source = ?
+        ''', (source,)) as cursor:
+            rows = await cursor.fetchall()
+            return {
+                feed: (datetime.fromisoformat(last_published), set(json.loads(seen_ids)))
+                for feed, last_published, seen_ids in rows
+            }
+
+async def save_watermarks(source, marks, feed_states=None):
+    """
+    Persist watermarks for a source: {feed: (last_published, seen_ids)}
+    and, in the same transaction, feed polling state:
+    {feed_key: (last_entry_id, etag, last_modified)}
+    """
+    if not marks and not feed_states:
+        return
+    async def write(db):
+        await db.executemany('''
+            INSERT OR REPLACE INTO source_watermarks (source, feed, last_published, seen_ids)
+            VALUES (?, ?, ?, ?)
+        ''', [
+            (source, feed, last_published.isoformat(), json.dumps(sorted(seen_ids)))
+            for feed, (last_published, seen_ids) in marks.items()
+        ])
+        await db.executemany('''
+            INSERT OR REPLACE INTO feed_state (feed_key, last_entry_id, etag, last_modified, updated_at)
+            VALUES (?, ?, ?, ?, datetime('now'))
+        ''', [
+            (feed_key, *state) for feed_key, state in (feed_states or {}).items()
+        ])
+    await get_writer().submit(write)
+
+# SQLite's default cap on bound parameters is 999
+SQL_PARAM_CHUNK = 500
+
+async def get_cached_sentiments(text_hashes, model_id, ttl_hours):
+    """Get unexpired sentiment results: {text_hash: ({'label', 'score'}, age_seconds)}"""
+    text_hashes = list(text_hashes)
+    found = {}
+    async with connection() as db:
+        for start in range(0, len(text_hashes), SQL_PARAM_CHUNK):
+            chunk = text_hashes[start:start + SQL_PARAM_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            async with db.execute(f'''
+                SELECT text_hash, label, score,
+                       (julianday('now') - julianday(created_at)) * 86400
+                FROM sentiment_cache
+                WHERE model_id = ?
+                AND created_at > datetime('now', '-' || ? || ' hours')
+                AND text_hash IN ({placeholders})
+            ''', (model_id, ttl_hours, *chunk)) as cursor:
+                for text_hash, label, score, age in await cursor.fetchall():
+                    found[text_hash] = ({'label': label, 'score': score}, age)
+    return found
+
+async def save_sentiments(results, model_id, ttl_hours):
+    """Store sentiment results ({text_hash: {'label', 'score'}}) and drop expired ones"""
+    if not results:
+        return
+    async def write(db):
+        await db.executemany('''
+            INSERT OR REPLACE INTO sentiment_cache (text_hash, model_id, label, score, created_at)
+            VALUES (?, ?, ?, ?, datetime('now'))
+        ''', [
+            (text_hash, model_id, result['label'], result['score'])
+            for text_hash, result in results.items()
+        ])
         await db.execute('''
-            INSERT INTO alert_history (signal_id, ticker, timestamp)
-            VALUES (?, ?, datetime('now'))
-        ''', (signal_id, ticker))
-        await db.commit()
\ No newline at end of file
+            DELETE FROM sentiment_cache
+            WHERE created_at <= datetime('now', '-' || ? || ' hours')
+        ''', (ttl_hours,))
+    await get_writer().submit(write)
+
+# Time column each retention TTL applies to
+RETENTION_COLUMNS = {
+    'alert_history': 'timestamp',
+    'signals': 'created_at',
+    'content_cache': 'created_at',
+}
+
+async def run_retention():
+    """
+    Delete rows older than their table's RETENTION_DAYS, hand up to
+    DB_VACUUM_PAGES free pages back to the filesystem and refresh
+    planner statistics
+    Returns: {table: rows deleted}
+    """
+    async def write(db):
+        deleted = {}
+        for table, column in RETENTION_COLUMNS.items():
+            cursor = await db.execute(
+                f"DELETE FROM {table} WHERE {column} < datetime('now', '-' || ? || ' days')",
+                (RETENTION_DAYS[table],)
+            )
+            deleted[table] = cursor.rowcount
+        await db.execute(f'PRAGMA incremental_vacuum({DB_VACUUM_PAGES})')
+        await db.execute('ANALYZE')
+        return deleted
+    return await get_writer().submit(write)
+
+async def check_query_plans():
+    """
+    EXPLAIN QUERY PLAN for the hot queries
+    Returns: [(name, plan, ok)]; ok means the expected index is used
+    """
+    queries = [
+        ('alerts_today', ALERTS_TODAY_SQL, (), 'idx_alert_history_timestamp'),
+        ('cooldown', COOLDOWN_SQL, ('AAPL', 4), 'sqlite_autoindex_ticker_cooldowns_1'),
+        ('duplicates', f'SELECT content_hash FROM content_cache WHERE content_hash IN (?, ?) AND {DEDUP_WINDOW_SQL}',
+         ('a', 'b', CONTENT_DEDUP_DAYS), 'sqlite_autoindex_content_cache_1'),
+    ] + [
+        (f"retention:{table}", f"DELETE FROM {table} WHERE {column} < datetime('now', '-' || ? || ' days')",
+         (30,), f"idx_{table}_{column}")
+        for table, column in RETENTION_COLUMNS.items()
+    ]
+    
+    report = []
+    async with connection() as db:
+        for name, sql, params, index in queries:
+            async with db.execute(f'EXPLAIN QUERY PLAN {sql}', params) as cursor:
+                plan = '; '.join(row[3] for row in await cursor.fetchall())
+            report.append((name, plan, f'INDEX {index}' in plan))
+    return report
@@ -1,90 +1,96 @@
 import re
-from config.settings import WATCHLIST
+from processing.ticker_matcher import get_ticker_matcher
+
+# Event keywords in priority order: the first event type with any keyword wins
+EVENT_KEYWORDS = {
+    'earnings': ['earnings', 'revenue', 'eps', 'profit'],
+    'ma': ['acquisition', 'merger', 'acquired', 'bought'],
+    'management': ['ceo', 'cfo', 'executive', 'appointment', 'departure'],
+    'product': ['product', 'launch', 'release', 'announced'],
+    'regulatory': ['regulation', 'sec', 'ftc', 'investigation'],
+}
+
+# Multipliers for "$1.2B", "3.5 million", "450 mn", ...
+UNIT_MULTIPLIERS = {
+    't': 1e12, 'trillion': 1e12,
+    'b': 1e9, 'bn': 1e9, 'billion': 1e9,
+    'm': 1e6, 'mn': 1e6, 'million': 1e6,
+    'k': 1e3, 'thousand': 1e3,
+}
+
+# Financial figures, matched against lower-cased text. Patterns that can't
+# start with a literal are only run once a cheap substring check passes.
+REVENUE_PATTERN = re.compile(r'revenue[:\s]+\$?(\d+\.?\d*)\s*(billion|million|b|m)?')
+EPS_PATTERN = re.compile(r'eps[:\s]+\$?(\d+\.?\d*)')
+PERCENT_PATTERN = re.compile(r'(\d+\.?\d*)%')
+GUIDANCE_PATTERN = re.compile(
+    r'(?:guidance|outlook)[^.$\d]{0,40}\$(\d[\d,]*\.?\d*)\s*(trillion|billion|million|bn|mn|[tbmk])?(?![a-z])'
+)
+SHARES_PATTERN = re.compile(
+    r'(\d[\d,]*\.?\d*)\s*(billion|million|thousand|bn|mn|[bmk])?\s+(?:common\s+)?shares'
+)
 
 def extract_ticker(text):
-    """Extract ticker symbol from text"""
-    text_upper = text.upper()
-    
-    # Try exact match first
-    for ticker in WATCHLIST:
-        pattern = r'\b' + re.escape(ticker) + r'\b'
-        if re.search(pattern, text_upper):
-            return ticker
-    
-    # Try company name mapping (common ones)
-    company_names = {
-        'APPLE': 'AAPL',
-        'MICROSOFT': 'MSFT',
-        'ALPHABET': 'GOOGL',
-        'GOOGLE': 'GOOGL',
-        'AMAZON': 'AMZN',
-        'NVIDIA': 'NVDA',
-        'META': 'META',
-        'FACEBOOK': 'META',
-        'TESLA': 'TSLA',
-        'AMD': 'AMD',
-        'INTEL': 'INTC',
-        'TSMC': 'TSM',
-        'TAIWAN SEMI': 'TSM',
-    }
-    
-    for company, ticker in company_names.items():
-        if company in text_upper and ticker in WATCHLIST:
-            return ticker
-    
-    return None
+    """Extract ticker symbol from text (symbols first, then company names)"""
+    return get_ticker_matcher().first(text)
 
-def extract_numbers(text):
-    """Extract financial numbers from text"""
+def extract_tickers(text):
+    """Extract every ticker mention from text as (ticker, start, end)"""
+    return get_ticker_matcher().find_all(text)
+
+def _scale(value, unit):
+    """Parse a matched number, applying its unit multiplier"""
+    value = float(value.replace(',', ''))
+    if unit:
+        value *= UNIT_MULTIPLIERS[unit]
+    return value
+
+def _event_type(text_lower):
+    """First event type (in priority order) with a keyword in the text"""
+    for event_type, words in EVENT_KEYWORDS.items():
+        if any(word in text_lower for word in words):
+            return event_type
+    return 'general'
+
+def _numbers(text_lower):
+    """Revenue, EPS, percentages, guidance and share counts from lower-cased text"""
     numbers = {}
     
-    # Revenue patterns
-    revenue_pattern = r'revenue[:\s]+\$?(\d+\.?\d*)\s*(billion|million|B|M)?'
-    revenue_match = re.search(revenue_pattern, text, re.IGNORECASE)
+    revenue_match = REVENUE_PATTERN.search(text_lower)
     if revenue_match:
-        value = float(revenue_match.group(1))
-        unit = revenue_match.group(2)
-        if unit and unit.upper() in ['BILLION', 'B']:
-            value *= 1_000_000_000
-        elif unit and unit.upper() in ['MILLION', 'M']:
-            value *= 1_000_000
-        numbers['revenue'] = value
+        numbers['revenue'] = _scale(revenue_match.group(1), revenue_match.group(2))
     
-    # EPS patterns
-    eps_pattern = r'EPS[:\s]+\$?(\d+\.?\d*)'
-    eps_match = re.search(eps_pattern, text, re.IGNORECASE)
+    eps_match = EPS_PATTERN.search(text_lower)
     if eps_match:
         numbers['eps'] = float(eps_match.group(1))
     
-    # Percentage patterns
-    pct_pattern = r'(\d+\.?\d*)%'
-    pct_matches = re.findall(pct_pattern, text)
-    if pct_matches:
-        numbers['percentages'] = [float(p) for p in pct_matches]
+    if '%' in text_lower:
+        pct_matches = PERCENT_PATTERN.findall(text_lower)
+        if pct_matches:
+            numbers['percentages'] = [float(p) for p in pct_matches]
+    
+    if 'guidance' in text_lower or 'outlook' in text_lower:
+        guidance_match = GUIDANCE_PATTERN.search(text_lower)
+        if guidance_match:
+            numbers['guidance'] = _scale(guidance_match.group(1), guidance_match.group(2))
+    
+    if 'shares' in text_lower:
+        shares_match = SHARES_PATTERN.search(text_lower)
+        if shares_match:
+            numbers['shares'] = _scale(shares_match.group(1), shares_match.group(2))
     
     return numbers
 
+def extract_numbers(text):
+    """Extract financial numbers (revenue, EPS, percentages, guidance, shares) from text"""
+    return _numbers(text.lower())
+
 def extract_entities(text):
     """Extract key entities (simplified without spaCy for now)"""
-    entities = {
-        'ticker': extract_ticker(text),
-        'numbers': extract_numbers(text),
-    }
-    
-    # Detect event types
     text_lower = text.lower()
     
-    if any(word in text_lower for word in ['earnings', 'revenue', 'eps', 'profit']):
-        entities['event_type'] = 'earnings'
-    elif any(word in text_lower for word in ['acquisition', 'merger', 'acquired', 'bought']):
-        entities['event_type'] = 'ma'
-    elif any(word in text_lower for word in ['ceo', 'cfo', 'executive', 'appointment', 'departure']):
-        entities['event_type'] = 'management'
-    elif any(word in text_lower for word in ['product', 'launch', 'release', 'announced']):
-        entities['event_type'] = 'product'
-    elif any(word in text_lower for word in ['regulation', 'sec', 'ftc', 'investigation']):
-        entities['event_type'] = 'regulatory'
-    else:
-        entities['event_type'] = 'general'
-    
-    return entities
\ No newline at end of file
+    return {
+        'ticker': extract_ticker(text),
+        'numbers': _numbers(text_lower),
+        'event_type': _event_type(text_lower)
+    }
\ No newline at end of file
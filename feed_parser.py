@@ -0,0 +1,154 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from lxml import etree
+from config.settings import FEED_PARSE_WORKERS, FEED_PARSER_BACKEND
+
+# Parsing is CPU-bound; keep it off the event loop
+_executor = ThreadPoolExecutor(max_workers=FEED_PARSE_WORKERS, thread_name_prefix='feed-parse')
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+
+ENTRY_TAGS = ('item', f'{ATOM}entry', f'{RSS1}item')
+
+# Feeds are newest first; stop after this many consecutive entries
+# older than the lookback window (tolerates slightly unsorted feeds)
+OLD_ENTRY_RUN = 3
+
+def _entry_time(entry, field):
+    """Convert feedparser's struct_time field to a naive UTC datetime"""
+    parsed = entry.get(f'{field}_parsed')
+    return datetime(*parsed[:6]) if parsed else None
+
+def _parse_date(value):
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date to a naive UTC datetime"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if value[:4].isdigit():
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        else:
+            parsed = parsedate_to_datetime(value)
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _text(elem):
+    if elem is None:
+        return ''
+    return ''.join(elem.itertext()).strip()
+
+def _read_entry(elem):
+    """Pull the fields we use out of an <item>/<entry> element"""
+    fields = {}
+    for child in elem:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue  # Comments and processing instructions
+        local = tag.rsplit('}', 1)[-1]
+        
+        if local == 'link':
+            href = child.get('href')
+            if href is None:
+                fields.setdefault('link', _text(child))
+            elif child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', href)
+        elif local in ('title', 'id', 'guid', 'summary', 'description', 'content',
+                       'published', 'updated', 'pubDate') or tag == f'{DC}date':
+            fields.setdefault(local, _text(child))
+    
+    link = fields.get('link', '')
+    published = _parse_date(fields.get('published') or fields.get('pubDate') or fields.get('date'))
+    return {
+        'id': fields.get('id') or fields.get('guid') or link,
+        'title': fields.get('title', ''),
+        'link': link,
+        'summary': fields.get('summary') or fields.get('description') or fields.get('content', ''),
+        'published': published,
+        'updated': _parse_date(fields.get('updated')) or published  # Same fallback as feedparser
+    }
+
+def _parse_fast(body, since=None):
+    """
+    Stream entries with lxml iterparse, clearing each element once read
+    Returns None if the document has no recognisable entries;
+    raises etree.XMLSyntaxError on malformed documents.
+    """
+    entries = []
+    matched = 0
+    old_run = 0
+    context = etree.iterparse(
+        io.BytesIO(body),
+        events=('end',),
+        tag=ENTRY_TAGS,
+        resolve_entities=False,
+        no_network=True
+    )
+    
+    for _, elem in context:
+        matched += 1
+        entry = _read_entry(elem)
+        
+        # Free the entry and anything before it
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        
+        timestamp = entry['published'] or entry['updated']
+        if since is not None and timestamp is not None and timestamp < since:
+            old_run += 1
+            if old_run >= OLD_ENTRY_RUN:
+                break
+            continue
+        old_run = 0
+        entries.append(entry)
+    
+    return entries if matched else None
+
+def _parse_feedparser(body, since=None):
+    """Parse with feedparser (slow, but tolerant of malformed feeds)"""
+    import feedparser  # Fallback only; most feeds never need it
+    
+    feed = feedparser.parse(body)
+    entries = []
+    
+    for entry in feed.entries:
+        entries.append({
+            'id': entry.get('id') or entry.get('link', ''),
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'summary': entry.get('summary', entry.get('description', '')),
+            'published': _entry_time(entry, 'published'),
+            'updated': _entry_time(entry, 'updated')
+        })
+    
+    return entries
+
+def parse_entries(body, since=None, backend=None):
+    """
+    Parse an RSS/Atom document into normalized entries
+    `since` lets the fast backend stop once entries leave the lookback
+    window; callers still apply their own cutoff to what comes back.
+    Returns: list of dicts with id, title, link, summary, published, updated
+    """
+    backend = backend or FEED_PARSER_BACKEND
+    if backend == 'fast':
+        try:
+            entries = _parse_fast(body, since)
+            if entries is not None:
+                return entries
+        except etree.XMLSyntaxError:
+            pass
+    return _parse_feedparser(body, since)
+
+async def parse_feed(body, since=None):
+    """Parse a feed document in the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, parse_entries, body, since)
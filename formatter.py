@@ -59,6 +59,19 @@ class AlertFormatter:
                 inline=False
             )
         
+        # Composite alerts list every report of the event
+        sources = signal.get('sources', [])
+        if len(sources) > 1:
+            embed.add_field(
+                name=f"📰 Sources ({len(sources)})",
+                value='\n'.join(
+                    f"[{source['source'] or 'Link'} - {source['signal_type'].replace('_', ' ').title()}]({source['url']})"
+                    if source['url'] else f"{source['source']} - {source['signal_type'].replace('_', ' ').title()}"
+                    for source in sources
+                )[:1024],  # Discord limit
+                inline=False
+            )
+        
         # Add source link
         if signal.get('source_url'):
             embed.add_field(
@@ -1,36 +1,51 @@
-from fredapi import Fred
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 from config.settings import FRED_API_KEY
 from config.sources import FRED_SERIES
+from ingestion.watermark import lookback_cutoff
 
 class FREDIngestor:
     """Ingest economic data from FRED API"""
     
     def __init__(self):
         if FRED_API_KEY:
+            from fredapi import Fred  # Pulls in pandas; only when FRED is enabled
             self.fred = Fred(api_key=FRED_API_KEY)
         else:
             self.fred = None
             print("⚠️  FRED API key not found - macro data disabled")
     
-    async def get_recent_data(self, hours=24):
-        """Get recent economic data releases"""
+    async def get_recent_data(self, hours=24, results=None, watermarks=None):
+        """
+        Get recent economic data releases
+        Data points are appended to `results` as each series is fetched.
+        With `watermarks`, only observations newer than the last one seen
+        per series are returned.
+        """
+        data_points = results if results is not None else []
         if not self.fred:
-            return []
-        
-        data_points = []
-        cutoff_date = datetime.now() - timedelta(hours=hours)
+            return data_points
         
         for series_name, series_id in FRED_SERIES.items():
             try:
+                cutoff_date = lookback_cutoff(watermarks, series_id, hours)
+                
                 # Get latest observation
-                series_data = self.fred.get_series(series_id, observation_start=cutoff_date.date())
+                series_data = await asyncio.to_thread(
+                    self.fred.get_series,
+                    series_id,
+                    observation_start=cutoff_date.date()
+                )
                 
                 if series_data.empty:
                     continue
                 
                 latest_value = series_data.iloc[-1]
                 latest_date = series_data.index[-1]
+                observed_at = datetime.combine(latest_date, datetime.min.time())
+                
+                if watermarks and not watermarks.accept(series_id, observed_at, series_id):
+                    continue
                 
                 # Calculate change if we have previous data
                 change = None
@@ -46,7 +61,7 @@ class FREDIngestor:
                     'series_name': series_name,
                     'series_id': series_id,
                     'value': latest_value,
-                    'timestamp': datetime.combine(latest_date, datetime.min.time()),
+                    'timestamp': observed_at,
                     'change': change,
                     'change_pct': change_pct,
                     'text': f"{series_name}: {latest_value:.2f}" + 
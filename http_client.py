@@ -0,0 +1,150 @@
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+import aiohttp
+from config.settings import (
+    HTTP_TIMEOUT, HTTP_MAX_RETRIES, HTTP_POOL_PER_HOST,
+    HTTP_RATE_LIMITS, HTTP_DEFAULT_RATE_LIMIT
+)
+
+# Responses worth retrying (rate limited or upstream trouble)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests/second, bursts up to `capacity`"""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class HTTPResponse:
+    """Fully-read HTTP response"""
+    
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+    
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+class HTTPClient:
+    """
+    Shared async HTTP client for all ingestors
+    One keep-alive connection pool, a token bucket per host and
+    jittered exponential backoff on transient failures.
+    """
+    
+    def __init__(self):
+        self._session = None
+        self._buckets = {}
+        self.stats = defaultdict(Counter)
+    
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=HTTP_POOL_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+            )
+        return self._session
+    
+    def _get_bucket(self, host):
+        if host not in self._buckets:
+            rate = HTTP_RATE_LIMITS.get(host, HTTP_DEFAULT_RATE_LIMIT)
+            self._buckets[host] = TokenBucket(rate)
+        return self._buckets[host]
+    
+    @staticmethod
+    def _backoff(attempt):
+        """Full-jitter exponential backoff, capped at 30 seconds"""
+        return random.uniform(0, min(30, 0.5 * 2 ** attempt))
+    
+    async def get(self, url, params=None, headers=None):
+        """
+        GET a URL, honouring the host's rate limit and retrying transient errors
+        Returns: HTTPResponse (raises after the last failed attempt)
+        """
+        host = urlparse(url).hostname
+        stats = self.stats[host]
+        bucket = self._get_bucket(host)
+        session = self._get_session()
+        
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            await bucket.acquire()
+            stats['requests'] += 1
+            started = time.monotonic()
+            
+            try:
+                async with session.get(url, params=params, headers=headers) as resp:
+                    body = await resp.read()
+                    response = HTTPResponse(str(resp.url), resp.status, resp.headers, body)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                stats['errors'] += 1
+                if attempt == HTTP_MAX_RETRIES:
+                    raise
+                stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            finally:
+                stats['elapsed_ms'] += int((time.monotonic() - started) * 1000)
+            
+            stats[f'status_{response.status}'] += 1
+            stats['bytes'] += len(body)
+            
+            if response.status in RETRY_STATUSES and attempt < HTTP_MAX_RETRIES:
+                stats['retries'] += 1
+                delay = self._backoff(attempt)
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                await asyncio.sleep(delay)
+                continue
+            
+            return response
+    
+    def summary(self):
+        """Total request/error counts across all hosts"""
+        totals = Counter()
+        for host_stats in self.stats.values():
+            totals.update(host_stats)
+        return totals
+    
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+# Global instance (one pool shared by every ingestor)
+http_client = None
+
+def get_http_client():
+    """Get or create shared HTTP client singleton"""
+    global http_client
+    if http_client is None:
+        http_client = HTTPClient()
+    return http_client
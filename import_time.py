@@ -0,0 +1,91 @@
+"""
+Cold-start import time for the bot, from `python -X importtime`
+
+Usage:
+    python import_time.py             # Summary of what `import bot` costs
+    python import_time.py --check     # Exit 1 if over IMPORT_TIME_BUDGET_MS
+
+Each measurement runs in a fresh interpreter, so nothing is already in
+sys.modules; the best of a few runs is used to smooth out disk noise.
+"""
+
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+ImportEntry = namedtuple('ImportEntry', ['name', 'depth', 'self_us', 'cumulative_us'])
+
+def parse_importtime(output):
+    """Parse `-X importtime` stderr into ImportEntry rows (in completion order)"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header row
+        
+        name_field = fields[2].rstrip()
+        depth = (len(name_field) - len(name_field.lstrip()) - 1) // 2
+        entries.append(ImportEntry(name_field.strip(), depth, int(fields[0]), int(fields[1])))
+    return entries
+
+def measure_imports(module='bot', runs=3):
+    """
+    Import `module` in fresh interpreters and keep the fastest run
+    Returns: (total_ms, [(direct import, cumulative_ms)] slowest first)
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        
+        entries = parse_importtime(result.stderr)
+        total = next(entry for entry in reversed(entries) if entry.name == module and entry.depth == 0)
+        if best is None or total.cumulative_us < best[0].cumulative_us:
+            best = (total, entries)
+    
+    total, entries = best
+    
+    # Direct imports of the module are the depth-1 rows printed before it
+    direct = [entry for entry in entries[:entries.index(total)] if entry.depth == 1]
+    direct.sort(key=lambda entry: entry.cumulative_us, reverse=True)
+    
+    return total.cumulative_us / 1000, [(entry.name, entry.cumulative_us / 1000) for entry in direct]
+
+def format_report(total_ms, direct, top=8):
+    """Short, log-friendly summary of an import measurement"""
+    lines = [f"📦 Import time: {total_ms:.0f}ms"]
+    for name, cumulative_ms in direct[:top]:
+        lines.append(f"     {name:<32}{cumulative_ms:>8.0f}ms ({cumulative_ms / total_ms:.0%})")
+    return '\n'.join(lines)
+
+def check_budget(budget_ms=None):
+    """Fail (exit 1) if importing the bot takes longer than the budget"""
+    if budget_ms is None:
+        sys.path.insert(0, ROOT)
+        from config.settings import IMPORT_TIME_BUDGET_MS
+        budget_ms = IMPORT_TIME_BUDGET_MS
+    
+    total_ms, direct = measure_imports()
+    print(format_report(total_ms, direct))
+    
+    if total_ms > budget_ms:
+        print(f"❌ Import time {total_ms:.0f}ms is over the {budget_ms}ms budget")
+        sys.exit(1)
+    print(f"✅ Within the {budget_ms}ms budget")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--check':
+        check_budget(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        print(format_report(*measure_imports()))
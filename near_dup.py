@@ -0,0 +1,157 @@
+import hashlib
+import re
+import time
+from collections import Counter, deque
+from config.settings import (
+    SOURCE_TRUST, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_BANDS, NEAR_DUP_WINDOW_HOURS
+)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+PUBLISHER_SUFFIX_PATTERN = re.compile(r'\s+[-|]\s+[^-|]{1,40}$')  # "... - Reuters" ending aggregator titles
+SHINGLE_SIZE = 1  # Words per shingle; headlines are too short for longer ones to survive a reword
+MIN_TOKENS = 5    # Shorter texts are left to the exact-hash check
+
+def normalize(text):
+    """Lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def content_tokens(content):
+    """
+    Tokens to fingerprint: the title without an aggregator's trailing
+    publisher name, then whatever the text adds after the title
+    (sources build 'text' as the title followed by the summary)
+    """
+    title = content.get('title', '')
+    text = content.get('text', title)
+    if title and text.startswith(title):
+        text = PUBLISHER_SUFFIX_PATTERN.sub('', title) + text[len(title):]
+    return normalize(text)
+
+def simhash(tokens):
+    """
+    64-bit SimHash over word shingles
+    Returns: fingerprint int, or None if there are too few tokens to compare
+    """
+    if len(tokens) < MIN_TOKENS:
+        return None
+    
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(
+            ' '.join(tokens[i:i + SHINGLE_SIZE]).encode(), digest_size=8
+        ).digest(), 'big'), '064b')
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    ]
+    
+    # Each bit is the majority vote of the shingle hashes (zip(*rows) gives bit columns)
+    half = len(rows) / 2
+    return int(''.join('1' if column.count('1') > half else '0' for column in zip(*rows)), 2)
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def source_rank(source):
+    """Position in SOURCE_TRUST (lower is more trusted); company IR feeds are '<TICKER>_IR'"""
+    if source not in SOURCE_TRUST and 'IR' in source:
+        source = 'Company IR'
+    return SOURCE_TRUST.index(source) if source in SOURCE_TRUST else len(SOURCE_TRUST)
+
+class SimHashIndex:
+    """
+    Fingerprints from the last NEAR_DUP_WINDOW_HOURS, bucketed by band
+    Each fingerprint is split into NEAR_DUP_BANDS bands; two fingerprints
+    within NEAR_DUP_MAX_DISTANCE bits (fewer than the number of bands)
+    must agree exactly on at least one band, so only same-band entries
+    are compared. Matches must also quote the same figures: a reworded
+    story keeps its numbers, a follow-up with new ones is news.
+    """
+    
+    def __init__(self, bands=NEAR_DUP_BANDS, max_distance=NEAR_DUP_MAX_DISTANCE, window_hours=NEAR_DUP_WINDOW_HOURS):
+        self.band_bits = 64 // bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.bands = [{} for _ in range(bands)]  # band value -> [entry]
+        self.max_distance = max_distance
+        self.window = window_hours * 3600
+        self.entries = deque()  # (added_at, fingerprint, ticker, figures), oldest first
+    
+    def _band_values(self, fingerprint):
+        return [(fingerprint >> (i * self.band_bits)) & self.band_mask for i in range(len(self.bands))]
+    
+    def expire(self, now=None):
+        """Drop fingerprints older than the window"""
+        cutoff = (now or time.monotonic()) - self.window
+        while self.entries and self.entries[0][0] < cutoff:
+            entry = self.entries.popleft()
+            for band, value in zip(self.bands, self._band_values(entry[1])):
+                bucket = band[value]
+                bucket.remove(entry)
+                if not bucket:
+                    del band[value]
+    
+    def add(self, fingerprint, ticker=None, figures=frozenset(), now=None):
+        entry = (now or time.monotonic(), fingerprint, ticker, figures)
+        self.entries.append(entry)
+        for band, value in zip(self.bands, self._band_values(fingerprint)):
+            band.setdefault(value, []).append(entry)
+    
+    def find(self, fingerprint, ticker=None, figures=frozenset()):
+        """
+        A stored fingerprint within max_distance with the same figures,
+        about the same ticker (or with no ticker on either side), or None
+        """
+        for band, value in zip(self.bands, self._band_values(fingerprint)):
+            for _, other, other_ticker, other_figures in band.get(value, ()):
+                if ticker and other_ticker and ticker != other_ticker:
+                    continue
+                if figures != other_figures:
+                    continue
+                if hamming(fingerprint, other) <= self.max_distance:
+                    return other
+        return None
+
+class NearDuplicateFilter:
+    """
+    Drop reworded copies of a story before signal detection
+    Within a batch the most trusted source's copy is kept; a story already
+    seen inside the window drops every later copy.
+    """
+    
+    def __init__(self):
+        self.index = SimHashIndex()
+        self.stats = Counter()
+    
+    def filter(self, contents):
+        """
+        Returns: the contents that are not near-duplicates, in input order
+        """
+        self.index.expire()
+        keep = [True] * len(contents)
+        
+        # Most trusted first, so it claims the story for its cluster
+        order = sorted(range(len(contents)), key=lambda i: source_rank(contents[i].get('source', '')))
+        for i in order:
+            content = contents[i]
+            tokens = content_tokens(content)
+            fingerprint = simhash(tokens)
+            self.stats['checked'] += 1
+            if fingerprint is None:
+                continue
+            
+            ticker = content.get('ticker')
+            figures = frozenset(token for token in tokens if token.isdigit())
+            if self.index.find(fingerprint, ticker, figures) is not None:
+                keep[i] = False
+                self.stats['near_duplicates'] += 1
+                continue
+            self.index.add(fingerprint, ticker, figures)
+        
+        return [content for content, kept in zip(contents, keep) if kept]
+
+# Global instance (the window spans scans)
+near_duplicate_filter = None
+
+def get_near_duplicate_filter():
+    """Get or create near-duplicate filter singleton"""
+    global near_duplicate_filter
+    if near_duplicate_filter is None:
+        near_duplicate_filter = NearDuplicateFilter()
+    return near_duplicate_filter
@@ -1,64 +1,126 @@
-import feedparser
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 from config.sources import RSS_FEEDS, COMPANY_IR_FEEDS, GOOGLE_NEWS_BASE
-from config.settings import WATCHLIST
-import re
+from config.settings import (
+    WATCHLIST, RSS_MAX_CONCURRENCY, GOOGLE_NEWS_BATCH_MODE,
+    GOOGLE_NEWS_MAX_QUERY_LENGTH, GOOGLE_NEWS_BATCHES_PER_SCAN
+)
+from ingestion.http_client import get_http_client
+from ingestion.feed_parser import parse_feed
+from ingestion.watermark import lookback_cutoff, record_feed_state
+from database.models import get_feed_state
+from processing.extractor import extract_tickers
+from processing.ticker_matcher import get_ticker_matcher
+from urllib.parse import quote_plus
+
+GOOGLE_NEWS_QUERY = '({}) stock when:1d'
 
 class RSSIngestor:
     """Ingest news from RSS feeds"""
     
-    async def get_recent_news(self, hours=24):
-        """Fetch recent news from all RSS sources"""
-        all_news = []
+    def __init__(self):
+        self.http = get_http_client()
+        
+        # Google News batches cover the whole watchlist; a few run per scan
+        self.gnews_batches = self._build_gnews_batches(sorted(WATCHLIST))
+        self.gnews_cursor = 0
+    
+    async def _fetch_feed(self, feed_url, feed_key, since=None, watermarks=None):
+        """
+        Download a feed with the stored ETag/Last-Modified and parse it in the worker pool
+        The new validators are saved with `watermarks` when they commit.
+        Returns: list of entries, or [] when the feed is unchanged (304)
+        """
+        state = await get_feed_state(feed_key)
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        
+        response = await self.http.get(feed_url, headers=headers)
+        if response.status == 304:
+            return []
+        if response.status != 200:
+            raise ValueError(f"HTTP {response.status}")
+        
+        entries = await parse_feed(response.body, since)
+        await record_feed_state(
+            watermarks,
+            feed_key,
+            entries[0]['id'] if entries else state.get('last_entry_id'),
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+        return entries
+    
+    async def get_recent_news(self, hours=24, results=None, watermarks=None):
+        """
+        Fetch recent news from all RSS sources concurrently
+        Items are appended to `results` as each feed completes. With
+        `watermarks`, only items newer than each feed's watermark are kept.
+        """
+        all_news = results if results is not None else []
+        semaphore = asyncio.Semaphore(RSS_MAX_CONCURRENCY)
+        
+        async def run(fetch, ticker=None):
+            async with semaphore:
+                news = await fetch
+            if ticker:
+                for item in news:
+                    item['ticker'] = ticker
+            all_news.extend(news)
+        
+        jobs = []
         
         # General news feeds
         for source_name, feed_url in RSS_FEEDS.items():
-            news = await self._parse_feed(feed_url, source_name, hours)
-            all_news.extend(news)
+            jobs.append(run(self._parse_feed(feed_url, source_name, hours, watermarks)))
         
         # Company IR feeds
         for ticker, feed_url in COMPANY_IR_FEEDS.items():
-            news = await self._parse_feed(feed_url, f'{ticker}_IR', hours)
-            for item in news:
-                item['ticker'] = ticker
-            all_news.extend(news)
+            jobs.append(run(self._parse_feed(feed_url, f'{ticker}_IR', hours, watermarks), ticker))
         
-        # Google News (per ticker)
-        for ticker in WATCHLIST[:5]:  # Limit to avoid rate limits
-            news = await self._get_google_news(ticker, hours)
-            all_news.extend(news)
+        # Google News
+        if GOOGLE_NEWS_BATCH_MODE:
+            for batch in self._next_gnews_batches():
+                jobs.append(run(self._get_google_news_batch(batch, hours, watermarks)))
+        else:
+            for ticker in WATCHLIST[:5]:  # Limit to avoid rate limits
+                jobs.append(run(self._get_google_news(ticker, hours, watermarks)))
+        
+        await asyncio.gather(*jobs)
         
         return all_news
     
-    async def _parse_feed(self, feed_url, source_name, hours):
+    async def _parse_feed(self, feed_url, source_name, hours, watermarks=None):
         """Parse RSS feed and return recent entries"""
         try:
-            feed = feedparser.parse(feed_url)
+            cutoff_time = lookback_cutoff(watermarks, source_name, hours)
+            entries = await self._fetch_feed(feed_url, f'rss:{source_name}', cutoff_time, watermarks)
             recent_news = []
-            cutoff_time = datetime.now() - timedelta(hours=hours)
             
-            for entry in feed.entries:
+            for entry in entries:
                 # Parse publish date
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6])
-                else:
-                    pub_date = datetime.now()
+                pub_date = entry['published'] or entry['updated']
                 
-                if pub_date < cutoff_time:
+                if pub_date is None:
+                    pub_date = datetime.now()  # Undated: leave to content dedup
+                elif pub_date < cutoff_time:
+                    continue
+                elif watermarks and not watermarks.accept(source_name, pub_date, entry['id']):
                     continue
                 
                 # Extract content
-                content = entry.get('summary', entry.get('description', ''))
+                content = entry['summary']
                 
                 news_item = {
                     'source': source_name,
-                    'title': entry.title,
-                    'url': entry.link,
+                    'title': entry['title'],
+                    'url': entry['link'],
                     'timestamp': pub_date,
-                    'text': f"{entry.title} - {content}",
-                    'ticker': self._extract_ticker(entry.title + ' ' + content)
+                    'text': f"{entry['title']} - {content}",
+                    'ticker': self._extract_ticker(entry['title'] + ' ' + content)
                 }
                 
                 recent_news.append(news_item)
@@ -69,32 +131,34 @@ class RSSIngestor:
             print(f"Error parsing feed {source_name}: {e}")
             return []
     
-    async def _get_google_news(self, ticker, hours):
+    async def _get_google_news(self, ticker, hours, watermarks=None):
         """Get Google News for specific ticker"""
+        feed = f'gnews:{ticker}'
         try:
             query = f"{ticker} stock when:1d"
             feed_url = GOOGLE_NEWS_BASE + query.replace(' ', '+')
             
-            feed = feedparser.parse(feed_url)
+            cutoff_time = lookback_cutoff(watermarks, feed, hours)
+            entries = await self._fetch_feed(feed_url, feed, cutoff_time, watermarks)
             recent_news = []
-            cutoff_time = datetime.now() - timedelta(hours=hours)
             
-            for entry in feed.entries[:5]:  # Limit to top 5
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                else:
-                    pub_date = datetime.now()
+            for entry in entries[:5]:  # Limit to top 5
+                pub_date = entry['published']
                 
-                if pub_date < cutoff_time:
+                if pub_date is None:
+                    pub_date = datetime.now()  # Undated: leave to content dedup
+                elif pub_date < cutoff_time:
+                    continue
+                elif watermarks and not watermarks.accept(feed, pub_date, entry['id']):
                     continue
                 
                 news_item = {
                     'source': 'Google News',
                     'ticker': ticker,
-                    'title': entry.title,
-                    'url': entry.link,
+                    'title': entry['title'],
+                    'url': entry['link'],
                     'timestamp': pub_date,
-                    'text': entry.title + ' ' + entry.get('summary', '')
+                    'text': entry['title'] + ' ' + entry['summary']
                 }
                 
                 recent_news.append(news_item)
@@ -105,14 +169,83 @@ class RSSIngestor:
             print(f"Error getting Google News for {ticker}: {e}")
             return []
     
-    def _extract_ticker(self, text):
-        """Extract ticker symbol from text"""
-        text_upper = text.upper()
+    @staticmethod
+    def _build_gnews_batches(tickers):
+        """Pack tickers into OR queries that stay under Google's query length limit"""
+        batches = []
+        current = []
+        
+        for ticker in tickers:
+            query = GOOGLE_NEWS_QUERY.format(' OR '.join(current + [ticker]))
+            if current and len(query) > GOOGLE_NEWS_MAX_QUERY_LENGTH:
+                batches.append(current)
+                current = []
+            current.append(ticker)
         
-        for ticker in WATCHLIST:
-            # Look for ticker as standalone word
-            pattern = r'\b' + re.escape(ticker) + r'\b'
-            if re.search(pattern, text_upper):
-                return ticker
+        if current:
+            batches.append(current)
         
-        return None
\ No newline at end of file
+        return batches
+    
+    def _next_gnews_batches(self):
+        """Take the next batches in rotation (every ticker covered within a few scans)"""
+        if not self.gnews_batches:
+            return []
+        
+        count = min(GOOGLE_NEWS_BATCHES_PER_SCAN, len(self.gnews_batches))
+        batches = [
+            self.gnews_batches[(self.gnews_cursor + i) % len(self.gnews_batches)]
+            for i in range(count)
+        ]
+        self.gnews_cursor = (self.gnews_cursor + count) % len(self.gnews_batches)
+        
+        return batches
+    
+    async def _get_google_news_batch(self, tickers, hours, watermarks=None):
+        """Get Google News for several tickers with one OR query"""
+        feed = f"gnews:{'+'.join(tickers)}"
+        try:
+            query = GOOGLE_NEWS_QUERY.format(' OR '.join(tickers))
+            feed_url = GOOGLE_NEWS_BASE + quote_plus(query)
+            
+            cutoff_time = lookback_cutoff(watermarks, feed, hours)
+            entries = await self._fetch_feed(feed_url, feed, cutoff_time, watermarks)
+            recent_news = []
+            
+            for entry in entries[:5 * len(tickers)]:  # Same top-5 budget per ticker
+                pub_date = entry['published']
+                
+                if pub_date is None:
+                    pub_date = datetime.now()  # Undated: leave to content dedup
+                elif pub_date < cutoff_time:
+                    continue
+                elif watermarks and not watermarks.accept(feed, pub_date, entry['id']):
+                    continue
+                
+                # The query matched one of the batch; work out which (other
+                # symbols in the text, e.g. "cost" or "v.", aren't what it asked for)
+                text = entry['title'] + ' ' + entry['summary']
+                ticker = next((ticker for ticker, _, _ in extract_tickers(text) if ticker in tickers), None)
+                if not ticker:
+                    continue
+                
+                news_item = {
+                    'source': 'Google News',
+                    'ticker': ticker,
+                    'title': entry['title'],
+                    'url': entry['link'],
+                    'timestamp': pub_date,
+                    'text': text
+                }
+                
+                recent_news.append(news_item)
+            
+            return recent_news
+            
+        except Exception as e:
+            print(f"Error getting Google News for {', '.join(tickers)}: {e}")
+            return []
+    
+    def _extract_ticker(self, text):
+        """Extract ticker symbol from text"""
+        return get_ticker_matcher().first(text, aliases=False)
\ No newline at end of file
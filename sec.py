@@ -1,8 +1,20 @@
-import requests
-import feedparser
-from datetime import datetime, timedelta
-from config.settings import WATCHLIST
+import asyncio
+import re
+from config.settings import WATCHLIST, SEC_INGEST_MODE, SEC_LATEST_MAX_PAGES
 from config.sources import SEC_CIK_MAP
+from ingestion.http_client import get_http_client
+from ingestion.feed_parser import parse_feed
+from ingestion.watermark import lookback_cutoff, record_feed_state
+from database.models import get_feed_state
+
+# Atom entry ids look like 'urn:tag:sec.gov,2008:accession-number=0000320193-24-000081'
+ACCESSION_PATTERN = re.compile(r'accession-number=([\d-]+)')
+
+# Current-filings titles look like '8-K - APPLE INC (0000320193) (Filer)'
+CURRENT_TITLE_PATTERN = re.compile(r'^(\S+) - .*?\((\d{10})\)')
+
+FILING_TYPES = ('8-K', '4')
+LATEST_PAGE_SIZE = 100  # EDGAR's maximum for getcurrent
 
 class SECIngestor:
     """Ingest SEC filings for watched tickers"""
@@ -12,30 +24,77 @@ class SECIngestor:
         self.headers = {
             'User-Agent': 'MarketIntelBot/1.0 (your-email@example.com)'
         }
+        self.http = get_http_client()
+        
+        # CIK -> ticker lookup for filtering the global current-filings feed
+        self.cik_index = {
+            int(cik): ticker
+            for ticker, cik in SEC_CIK_MAP.items()
+            if ticker in WATCHLIST
+        }
     
-    async def get_recent_filings(self, hours=24):
-        """Get recent 8-K and Form 4 filings for watchlist"""
-        filings = []
+    async def get_recent_filings(self, hours=24, results=None, watermarks=None):
+        """
+        Get recent 8-K and Form 4 filings for watchlist
+        Filings are appended to `results` as they arrive, so a caller that
+        times out still keeps everything fetched so far. With `watermarks`,
+        only filings newer than each feed's watermark are returned and
+        `hours` is just the cold-start backfill window.
+        """
+        filings = results if results is not None else []
         
-        for ticker in WATCHLIST:
-            if ticker not in SEC_CIK_MAP:
-                continue
-            
-            cik = SEC_CIK_MAP[ticker]
-            
-            # Get 8-K filings (material events)
-            filings_8k = await self._fetch_filing_type(ticker, cik, '8-K', hours)
-            filings.extend(filings_8k)
-            
-            # Get Form 4 filings (insider trades)
-            filings_form4 = await self._fetch_filing_type(ticker, cik, '4', hours)
-            filings.extend(filings_form4)
+        if SEC_INGEST_MODE == 'latest':
+            await self._fetch_latest_filings(hours, filings, watermarks)
+            return filings
+        
+        async def fetch(ticker, cik, filing_type):
+            filings.extend(await self._fetch_filing_type(ticker, cik, filing_type, hours, watermarks))
+        
+        # Get 8-K (material events) and Form 4 (insider trades) for every
+        # watched ticker; the shared client paces these to SEC's rate limit
+        await asyncio.gather(*(
+            fetch(ticker, cik, filing_type)
+            for ticker, cik in SEC_CIK_MAP.items()
+            if ticker in WATCHLIST
+            for filing_type in FILING_TYPES
+        ))
         
         return filings
     
-    async def _fetch_filing_type(self, ticker, cik, filing_type, hours):
-        """Fetch specific filing type for a ticker"""
+    async def _get_feed(self, params, state, since=None):
+        """
+        Fetch and parse an EDGAR atom feed, sending stored HTTP validators
+        Returns: (entries, response), with entries None on 304 or any non-200
+        """
+        headers = dict(self.headers)
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        
+        response = await self.http.get(
+            self.base_url,
+            params=params,
+            headers=headers
+        )
+        
+        if response.status != 200:
+            return None, response  # 304 Not Modified lands here too
+        
+        entries = await parse_feed(response.body, since)
+        return entries, response
+    
+    async def _fetch_filing_type(self, ticker, cik, filing_type, hours, watermarks=None):
+        """
+        Fetch new filings of one type for a ticker
+        Sends the stored ETag/Last-Modified so an unchanged feed costs a 304,
+        and stops at the last accession number seen on a previous poll.
+        """
+        feed = f"{cik}:{filing_type}"
+        feed_key = f"sec:{feed}"
         try:
+            state = await get_feed_state(feed_key)
+            
             params = {
                 'action': 'getcompany',
                 'CIK': cik,
@@ -46,45 +105,152 @@ class SECIngestor:
                 'output': 'atom'
             }
             
-            response = requests.get(
-                self.base_url,
-                params=params,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code != 200:
+            cutoff_time = lookback_cutoff(watermarks, feed, hours)
+            entries, response = await self._get_feed(params, state, cutoff_time)
+            if entries is None:
                 return []
             
-            feed = feedparser.parse(response.text)
             recent_filings = []
-            cutoff_time = datetime.now() - timedelta(hours=hours)
+            last_accession = state.get('last_entry_id')
             
-            for entry in feed.entries:
-                filing_date = datetime(*entry.updated_parsed[:6])
+            # Entries are newest first, so everything after the
+            # previous high-water mark has already been processed
+            for entry in entries:
+                accession = self._accession_number(entry)
+                if accession == last_accession:
+                    break
+                
+                filing_date = entry['updated']
                 
                 if filing_date < cutoff_time:
                     continue
+                if watermarks and not watermarks.accept(feed, filing_date, accession):
+                    continue
                 
-                filing = {
-                    'ticker': ticker,
-                    'source': 'SEC',
-                    'filing_type': filing_type,
-                    'title': entry.title,
-                    'summary': entry.summary,
-                    'url': entry.link,
-                    'timestamp': filing_date,
-                    'text': f"{entry.title} - {entry.summary}"
-                }
-                
-                recent_filings.append(filing)
+                recent_filings.append(self._build_filing(entry, ticker, filing_type, filing_date))
+            
+            newest = self._accession_number(entries[0]) if entries else last_accession
+            await record_feed_state(
+                watermarks,
+                feed_key,
+                newest,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
             
             return recent_filings
             
         except Exception as e:
             print(f"Error fetching {filing_type} for {ticker}: {e}")
             return []
-
+    
+    async def _fetch_latest_filings(self, hours, filings, watermarks=None):
+        """
+        Poll EDGAR's global current-filings feed and keep watched CIKs
+        Pages back until the previous high-water accession (or the lookback
+        cutoff), so a scan costs the same however many tickers are watched.
+        """
+        feed_key = 'sec:current'
+        try:
+            state = await get_feed_state(feed_key)
+            last_accession = state.get('last_entry_id')
+            cutoff_time = lookback_cutoff(watermarks, 'current', hours)
+            newest = None
+            first_response = None
+            caught_up = False
+            oldest_read = None
+            
+            for page in range(SEC_LATEST_MAX_PAGES):
+                params = {
+                    'action': 'getcurrent',
+                    'type': '',
+                    'company': '',
+                    'dateb': '',
+                    'owner': 'include',
+                    'start': str(page * LATEST_PAGE_SIZE),
+                    'count': str(LATEST_PAGE_SIZE),
+                    'output': 'atom'
+                }
+                
+                # Only the first page can be answered with a 304
+                entries, response = await self._get_feed(params, state if page == 0 else {}, cutoff_time)
+                if first_response is None:
+                    first_response = response
+                if not entries:
+                    break
+                
+                if newest is None:
+                    newest = self._accession_number(entries[0])
+                
+                reached_known = False
+                for entry in entries:
+                    accession = self._accession_number(entry)
+                    if accession == last_accession:
+                        reached_known = True
+                        break
+                    
+                    filing_date = entry['updated']
+                    if filing_date < cutoff_time:
+                        reached_known = True
+                        break
+                    oldest_read = filing_date
+                    
+                    match = CURRENT_TITLE_PATTERN.match(entry['title'])
+                    if not match:
+                        continue
+                    
+                    filing_type = match.group(1).split('/')[0]  # Amendments count as the base form
+                    ticker = self.cik_index.get(int(match.group(2)))
+                    if ticker is None or filing_type not in FILING_TYPES:
+                        continue
+                    if watermarks and not watermarks.accept('current', filing_date, accession):
+                        continue
+                    
+                    filings.append(self._build_filing(entry, ticker, filing_type, filing_date))
+                
+                if reached_known or len(entries) < LATEST_PAGE_SIZE:
+                    caught_up = True
+                    break
+            
+            # Out of pages before the previous mark: filings in between are
+            # skipped. Holding the mark back instead would re-read the same
+            # newest pages every scan and never catch up after an outage.
+            if newest is not None and not caught_up:
+                print(f"⚠️  SEC current feed: read {SEC_LATEST_MAX_PAGES} pages back to {oldest_read} "
+                      f"without reaching the previous mark ({cutoff_time}); filings in between are skipped. "
+                      f"Raise SEC_LATEST_MAX_PAGES or use SEC_INGEST_MODE='per_ticker'")
+            
+            if newest is not None:
+                await record_feed_state(
+                    watermarks,
+                    feed_key,
+                    newest,
+                    first_response.headers.get('ETag'),
+                    first_response.headers.get('Last-Modified')
+                )
+            
+        except Exception as e:
+            print(f"Error fetching current SEC filings: {e}")
+    
+    def _build_filing(self, entry, ticker, filing_type, filing_date):
+        """Build a filing content item from an atom entry"""
+        return {
+            'ticker': ticker,
+            'source': 'SEC',
+            'filing_type': filing_type,
+            'title': entry['title'],
+            'summary': entry['summary'],
+            'url': entry['link'],
+            'timestamp': filing_date,
+            'text': f"{entry['title']} - {entry['summary']}"
+        }
+    
+    @staticmethod
+    def _accession_number(entry):
+        """Extract the accession number from an EDGAR atom entry"""
+        match = ACCESSION_PATTERN.search(entry['id'])
+        return match.group(1) if match else entry['link']
+    
     def parse_8k_content(self, filing):
         """Extract key info from 8-K filing"""
         summary = filing.get('summary', '').lower()
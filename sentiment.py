@@ -1,20 +1,44 @@
-from transformers import pipeline
+import hashlib
+import re
+import time
 import warnings
+from collections import Counter, OrderedDict
+from config.settings import (
+    SENTIMENT_MODEL, SENTIMENT_BACKEND, SENTIMENT_BATCH_SIZE, SENTIMENT_MAX_TOKENS,
+    SENTIMENT_CACHE_SIZE, SENTIMENT_CACHE_TTL_HOURS
+)
+from database.models import get_cached_sentiments, save_sentiments
 warnings.filterwarnings('ignore')
 
+# Returned when the model is unavailable or fails; never cached
+NEUTRAL_RESULT = {'label': 'neutral', 'score': 0.5, 'fallback': True}
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def sentiment_model_id(backend=SENTIMENT_BACKEND):
+    """Model identity for cached results (quantized scores differ slightly)"""
+    return SENTIMENT_MODEL if backend == 'transformers' else f"{SENTIMENT_MODEL}:onnx-int8"
+
 class SentimentAnalyzer:
     """Analyze sentiment using FinBERT (financial sentiment model)"""
     
-    def __init__(self):
+    def __init__(self, backend=SENTIMENT_BACKEND):
+        self.backend = backend
         try:
-            # Use FinBERT for financial text
-            self.sentiment_pipeline = pipeline(
-                "sentiment-analysis",
-                model="ProsusAI/finbert",
-                device=-1  # CPU only (free hosting)
-            )
+            if backend == 'onnx':
+                # Int8 FinBERT on onnxruntime (export it first)
+                from processing.sentiment_onnx import OnnxSentimentPipeline
+                self.sentiment_pipeline = OnnxSentimentPipeline()
+            else:
+                # Use FinBERT for financial text
+                from transformers import pipeline
+                self.sentiment_pipeline = pipeline(
+                    "sentiment-analysis",
+                    model=SENTIMENT_MODEL,
+                    device=-1  # CPU only (free hosting)
+                )
             self.enabled = True
-            print("✅ FinBERT sentiment analyzer loaded")
+            print(f"✅ FinBERT sentiment analyzer loaded ({backend})")
         except Exception as e:
             print(f"⚠️  Could not load FinBERT: {e}")
             print("   Sentiment analysis will be disabled")
@@ -25,31 +49,52 @@ class SentimentAnalyzer:
         Analyze sentiment of text
         Returns: {'label': 'positive/negative/neutral', 'score': float}
         """
-        if not self.enabled:
-            return {'label': 'neutral', 'score': 0.5}
+        return self.analyze_many([text])[0]
+    
+    def analyze_many(self, texts):
+        """
+        Analyze sentiment of many texts in batched forward passes
+        Texts are bucketed by token length so each batch pads to a similar
+        size; the tokenizer truncates to the model's 512-token limit.
+        Returns: list of {'label', 'score'}, in input order
+        """
+        if not self.enabled or not texts:
+            return [dict(NEUTRAL_RESULT) for _ in texts]
         
         try:
-            # Truncate text to model's max length (512 tokens)
-            text = text[:2000]  # Rough approximation
+            tokenizer = self.sentiment_pipeline.tokenizer
+            lengths = [
+                len(ids) for ids in
+                tokenizer(texts, truncation=True, max_length=SENTIMENT_MAX_TOKENS)['input_ids']
+            ]
+            order = sorted(range(len(texts)), key=lengths.__getitem__)
             
-            result = self.sentiment_pipeline(text)[0]
+            results = [None] * len(texts)
+            for start in range(0, len(order), SENTIMENT_BATCH_SIZE):
+                bucket = order[start:start + SENTIMENT_BATCH_SIZE]
+                outputs = self.sentiment_pipeline(
+                    [texts[i] for i in bucket],
+                    batch_size=len(bucket),
+                    truncation=True,
+                    max_length=SENTIMENT_MAX_TOKENS
+                )
+                
+                # FinBERT returns 'positive', 'negative', 'neutral'
+                for i, output in zip(bucket, outputs):
+                    results[i] = {
+                        'label': output['label'].lower(),
+                        'score': output['score']
+                    }
             
-            # FinBERT returns 'positive', 'negative', 'neutral'
-            return {
-                'label': result['label'].lower(),
-                'score': result['score']
-            }
+            return results
             
         except Exception as e:
             print(f"Error analyzing sentiment: {e}")
-            return {'label': 'neutral', 'score': 0.5}
+            return [dict(NEUTRAL_RESULT) for _ in texts]
     
-    def get_sentiment_direction(self, text):
-        """
-        Simplified sentiment: BULLISH, BEARISH, or NEUTRAL
-        """
-        result = self.analyze(text)
-        
+    @staticmethod
+    def direction(result):
+        """Map an analyze() result to BULLISH, BEARISH, or NEUTRAL"""
         if result['score'] < 0.6:  # Low confidence
             return 'NEUTRAL'
         
@@ -60,6 +105,85 @@ class SentimentAnalyzer:
             return 'BEARISH'
         else:
             return 'NEUTRAL'
+    
+    def get_sentiment_direction(self, text):
+        """
+        Simplified sentiment: BULLISH, BEARISH, or NEUTRAL
+        """
+        return self.direction(self.analyze(text))
+    
+    def get_sentiment_directions(self, texts):
+        """Sentiment direction for many texts, batched"""
+        return [self.direction(result) for result in self.analyze_many(texts)]
+
+class SentimentCache:
+    """
+    Two-tier sentiment result cache: in-process LRU backed by SQLite
+    Keyed by a hash of the normalized text plus the model ID, so the same
+    story from Reuters, Google News and the IR page is scored once.
+    """
+    
+    def __init__(self, model_id=None, max_size=SENTIMENT_CACHE_SIZE, ttl_hours=SENTIMENT_CACHE_TTL_HOURS):
+        self.model_id = model_id or sentiment_model_id()
+        self.max_size = max_size
+        self.ttl_hours = ttl_hours
+        self.entries = OrderedDict()  # text_hash -> (result, stored_at)
+        self.stats = Counter()
+    
+    @staticmethod
+    def key(text):
+        """Hash of the normalized text (FinBERT is uncased, so case and spacing don't matter)"""
+        normalized = WHITESPACE_PATTERN.sub(' ', text).strip().lower()
+        return hashlib.sha256(normalized.encode()).hexdigest()
+    
+    def _remember(self, text_hash, result, age=0):
+        self.entries[text_hash] = (result, time.monotonic() - age)
+        self.entries.move_to_end(text_hash)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    async def get_many(self, text_hashes):
+        """
+        Look up results, memory first, then SQLite
+        Returns: {text_hash: result} for the hits
+        """
+        found = {}
+        missing = []
+        max_age = self.ttl_hours * 3600
+        now = time.monotonic()
+        
+        for text_hash in text_hashes:
+            entry = self.entries.get(text_hash)
+            if entry and now - entry[1] < max_age:
+                self.entries.move_to_end(text_hash)
+                found[text_hash] = entry[0]
+                self.stats['memory_hits'] += 1
+            else:
+                if entry:
+                    del self.entries[text_hash]
+                    self.stats['expired'] += 1
+                missing.append(text_hash)
+        
+        if missing:
+            stored = await get_cached_sentiments(missing, self.model_id, self.ttl_hours)
+            for text_hash, (result, age) in stored.items():
+                self._remember(text_hash, result, age)
+                found[text_hash] = result
+            self.stats['db_hits'] += len(stored)
+            self.stats['misses'] += len(missing) - len(stored)
+        
+        return found
+    
+    async def put_many(self, results):
+        """Store fresh model results ({text_hash: result}); fallbacks are skipped"""
+        results = {
+            text_hash: result for text_hash, result in results.items()
+            if not result.get('fallback')
+        }
+        for text_hash, result in results.items():
+            self._remember(text_hash, result)
+        await save_sentiments(results, self.model_id, self.ttl_hours)
 
 # Global instance (loaded once at startup)
 sentiment_analyzer = None
@@ -69,4 +193,13 @@ def get_sentiment_analyzer():
     global sentiment_analyzer
     if sentiment_analyzer is None:
         sentiment_analyzer = SentimentAnalyzer()
-    return sentiment_analyzer
\ No newline at end of file
+    return sentiment_analyzer
+
+sentiment_cache = None
+
+def get_sentiment_cache():
+    """Get or create sentiment cache singleton"""
+    global sentiment_cache
+    if sentiment_cache is None:
+        sentiment_cache = SentimentCache()
+    return sentiment_cache
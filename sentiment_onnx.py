@@ -0,0 +1,216 @@
+"""
+Quantized ONNX Runtime backend for FinBERT
+
+One-time setup (needs requirements-dev.txt, only on the machine that exports):
+    python -m processing.sentiment_onnx export
+
+Compare against the transformers backend on a labelled sample:
+    python -m processing.sentiment_onnx compare [sample.csv]
+
+The sample CSV has `text,label` rows with positive/negative/neutral labels;
+without one a small built-in sample is used.
+"""
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+from config.settings import SENTIMENT_MODEL, SENTIMENT_ONNX_DIR, SENTIMENT_WORKER_THREADS
+
+ONNX_MODEL_FILE = 'model_quantized.onnx'
+
+# Hand-labelled headlines for the agreement check
+LABELLED_SAMPLE = [
+    ("NVIDIA reports record data center revenue, up 112% year over year", 'positive'),
+    ("Costco same-store sales rise 7.1% in September, beating estimates", 'positive'),
+    ("Microsoft raises full-year guidance after strong cloud growth", 'positive'),
+    ("Eli Lilly shares jump as weight-loss drug sales triple", 'positive'),
+    ("Apple beats earnings expectations and announces $90 billion buyback", 'positive'),
+    ("Intel cuts dividend and warns of weaker third-quarter revenue", 'negative'),
+    ("Tesla deliveries miss estimates as price cuts weigh on margins", 'negative'),
+    ("Bank of America takes $1.2 billion charge on regulatory settlement", 'negative'),
+    ("UnitedHealth shares fall after medical costs exceed forecasts", 'negative'),
+    ("Super Micro delays annual filing, shares slide 20%", 'negative'),
+    ("Federal Reserve holds interest rates steady at 5.25% to 5.5%", 'neutral'),
+    ("Meta to hold annual shareholder meeting on May 29", 'neutral'),
+    ("Exxon Mobil files quarterly report with the SEC", 'neutral'),
+    ("Visa appoints new chief financial officer effective January 1", 'neutral'),
+    ("ASML to report second-quarter results on July 17", 'neutral'),
+]
+
+class OnnxSentimentPipeline:
+    """
+    Int8 FinBERT on onnxruntime, with the slice of the transformers
+    pipeline interface SentimentAnalyzer uses: `tokenizer(...)` and
+    calling it on a list of texts. Needs only onnxruntime, tokenizers
+    and numpy at runtime, not torch.
+    """
+    
+    def __init__(self, model_dir=SENTIMENT_ONNX_DIR, threads=SENTIMENT_WORKER_THREADS):
+        import numpy
+        import onnxruntime
+        from tokenizers import Tokenizer
+        
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"{model_path} not found - run `python -m processing.sentiment_onnx export` first")
+        
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.numpy = numpy
+        
+        self._tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        with open(os.path.join(model_dir, 'config.json')) as f:
+            self.labels = {int(i): label for i, label in json.load(f)['id2label'].items()}
+    
+    def _encode(self, texts, padding, truncation, max_length):
+        # The Tokenizer keeps padding/truncation between calls; set both every time
+        if padding:
+            self._tokenizer.enable_padding()
+        else:
+            self._tokenizer.no_padding()
+        if truncation:
+            self._tokenizer.enable_truncation(max_length)
+        else:
+            self._tokenizer.no_truncation()
+        return self._tokenizer.encode_batch(texts)
+    
+    def tokenizer(self, texts, truncation=True, max_length=512):
+        """Token IDs per text, like a transformers tokenizer call"""
+        return {'input_ids': [encoding.ids for encoding in self._encode(texts, False, truncation, max_length)]}
+    
+    def __call__(self, texts, batch_size=None, truncation=True, max_length=512):
+        """
+        Classify texts in one padded batch (callers bucket by length)
+        Returns: list of {'label', 'score'}
+        """
+        np = self.numpy
+        encodings = self._encode(texts, True, truncation, max_length)
+        
+        feeds = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(None, {name: feeds[name] for name in self.input_names})[0]
+        
+        # Softmax, as the text-classification pipeline does
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        
+        return [
+            {'label': self.labels[int(row.argmax())], 'score': float(row.max())}
+            for row in probs
+        ]
+
+def export(model_dir=SENTIMENT_ONNX_DIR):
+    """
+    Export FinBERT to ONNX and quantize it to int8
+    Dynamic quantization computes activation ranges at inference time, so
+    no calibration set is needed; `compare` is the accuracy check.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    
+    print(f"📦 Exporting {SENTIMENT_MODEL} to {model_dir}...")
+    model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, export=True)
+    model.save_pretrained(model_dir)
+    AutoTokenizer.from_pretrained(SENTIMENT_MODEL).save_pretrained(model_dir)
+    
+    print("🔧 Quantizing (dynamic int8)...")
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(
+        save_dir=model_dir,
+        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    )
+    
+    size_mb = os.path.getsize(os.path.join(model_dir, ONNX_MODEL_FILE)) / 1e6
+    print(f"✅ Wrote {ONNX_MODEL_FILE} ({size_mb:.0f} MB)")
+
+def _load_sample(path=None):
+    """(text, label) pairs from a CSV, or the built-in sample"""
+    if not path:
+        return LABELLED_SAMPLE
+    with open(path, newline='') as f:
+        return [(row['text'], row['label'].lower()) for row in csv.DictReader(f)]
+
+def measure(backend, sample_path=None):
+    """
+    Classify the sample through a sentiment worker process running one
+    backend, as the bot does, and report the worker's load time, latency
+    and peak RSS
+    """
+    import asyncio
+    import resource
+    from processing.sentiment_worker import SentimentWorker
+    
+    sample = _load_sample(sample_path)
+    texts = [text for text, _ in sample]
+    worker = SentimentWorker(backend=backend)
+    
+    started = time.perf_counter()
+    if not worker.start():
+        sys.exit(1)
+    load_seconds = time.perf_counter() - started
+    
+    async def classify():
+        await worker.analyze_many(texts[:2])  # Warm up
+        started = time.perf_counter()
+        results = await worker.analyze_many(texts)
+        batch_seconds = time.perf_counter() - started
+        await worker.close()
+        return results, batch_seconds
+    
+    results, batch_seconds = asyncio.run(classify())
+    
+    # The worker has exited and been joined, so it is counted in
+    # RUSAGE_CHILDREN; ru_maxrss is in kilobytes on Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    
+    print(json.dumps({
+        'labels': [result['label'] for result in results],
+        'load_seconds': load_seconds,
+        'ms_per_item': batch_seconds / len(texts) * 1000,
+        'rss_mb': rss_mb,
+    }))
+
+def compare(sample_path=None):
+    """Agreement, accuracy, latency and peak RSS for both backends"""
+    sample = _load_sample(sample_path)
+    expected = [label for _, label in sample]
+    
+    reports = {}
+    for backend in ('transformers', 'onnx'):
+        command = [sys.executable, '-m', 'processing.sentiment_onnx', 'measure', backend]
+        if sample_path:
+            command.append(sample_path)
+        run = subprocess.run(command, capture_output=True, text=True)
+        if run.returncode != 0:
+            print(f"❌ {backend} backend failed:\n{run.stdout}{run.stderr}")
+            return
+        reports[backend] = json.loads(run.stdout.strip().splitlines()[-1])
+    
+    print(f"{'backend':<14}{'accuracy':>10}{'load':>9}{'per item':>11}{'peak RSS':>11}")
+    for backend, report in reports.items():
+        correct = sum(a == b for a, b in zip(report['labels'], expected))
+        print(f"{backend:<14}{correct / len(expected):>9.0%}{report['load_seconds']:>8.1f}s"
+              f"{report['ms_per_item']:>9.1f}ms{report['rss_mb']:>8.0f} MB")
+    
+    agree = sum(a == b for a, b in zip(reports['transformers']['labels'], reports['onnx']['labels']))
+    print(f"\nBackend agreement: {agree}/{len(sample)} ({agree / len(sample):.0%})")
+    for (text, label), a, b in zip(sample, reports['transformers']['labels'], reports['onnx']['labels']):
+        if a != b:
+            print(f"  ≠ {text[:60]!r}: transformers={a}, onnx={b} (labelled {label})")
+
+if __name__ == "__main__":
+    commands = {'export': export, 'compare': compare, 'measure': measure}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(f"Usage: python -m processing.sentiment_onnx [{'|'.join(c for c in commands if c != 'measure')}]")
+        sys.exit(1)
+    
+    commands[sys.argv[1]](*sys.argv[2:])
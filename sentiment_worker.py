@@ -0,0 +1,247 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from collections import Counter
+from config.settings import (
+    SENTIMENT_BACKEND, SENTIMENT_WORKER, SENTIMENT_WORKER_THREADS, SENTIMENT_BATCH_WINDOW,
+    SENTIMENT_WORKER_MAX_BATCH, SENTIMENT_WORKER_TIMEOUT
+)
+from processing.sentiment import NEUTRAL_RESULT, get_sentiment_analyzer, get_sentiment_cache
+
+def _worker_main(requests, responses, threads, backend):
+    """Worker process: load FinBERT once, then answer batches until told to stop"""
+    # Pin intra-op threads before any runtime is imported, so inference
+    # doesn't compete with the bot process for every core
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    
+    from processing.sentiment import SentimentAnalyzer
+    if backend == 'transformers':  # The onnx backend never needs torch
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    
+    analyzer = SentimentAnalyzer(backend=backend)
+    responses.put(('ready', analyzer.enabled))
+    
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        
+        batch_id, texts = job
+        responses.put((batch_id, analyzer.analyze_many(texts)))
+
+class SentimentWorker:
+    """
+    FinBERT in a separate process, fronted by an async micro-batching queue
+    Requests arriving within SENTIMENT_BATCH_WINDOW are sent as one batch,
+    so the event loop never runs a forward pass. A worker that crashes or
+    hangs is restarted and its batch retried once.
+    """
+    
+    def __init__(self, backend=SENTIMENT_BACKEND):
+        self.backend = backend
+        self.queue = asyncio.Queue()
+        self.stats = Counter()
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._batcher = None
+        self._next_batch_id = 0
+    
+    async def analyze_many(self, texts):
+        """
+        Queue texts for the worker and wait for their results
+        Returns: list of {'label', 'score'}, in input order
+        """
+        if not texts:
+            return []
+        
+        if self._batcher is None or self._batcher.done():
+            self._batcher = asyncio.create_task(self._run_batches())
+        
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self.queue.put_nowait((text, future))
+            futures.append(future)
+        
+        self.stats['requests'] += len(texts)
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize())
+        
+        return await asyncio.gather(*futures)
+    
+    async def _run_batches(self):
+        """Collect requests for one batch window, then run them as one batch"""
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(SENTIMENT_BATCH_WINDOW)
+            while len(batch) < SENTIMENT_WORKER_MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            self.stats['batches'] += 1
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            
+            try:
+                results = await asyncio.to_thread(self._infer, [text for text, _ in batch])
+            except Exception as e:
+                print(f"Error in sentiment worker: {e}")
+                results = [dict(NEUTRAL_RESULT) for _ in batch]
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _start(self):
+        """Spawn a fresh worker process (spawn, so no torch state is forked)"""
+        context = multiprocessing.get_context('spawn')
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(self._requests, self._responses, SENTIMENT_WORKER_THREADS, self.backend),
+            name='sentiment-worker',
+            daemon=True
+        )
+        self._process.start()
+    
+    def start(self):
+        """
+        Spawn the worker and block until its model has loaded (run in a thread)
+        Returns: True if the model loaded
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        
+        deadline = time.monotonic() + SENTIMENT_WORKER_TIMEOUT
+        while self._process.is_alive() and time.monotonic() < deadline:
+            try:
+                message, enabled = self._responses.get(timeout=1)
+            except queue.Empty:
+                continue
+            if message == 'ready':
+                return enabled
+        return False
+    
+    def _stop(self):
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=5)
+        self._process = None
+    
+    def _infer(self, texts):
+        """Send one batch to the worker and block until it answers (runs in a thread)"""
+        for attempt in range(2):
+            if self._process is None or not self._process.is_alive():
+                if self._process is not None:
+                    print(f"⚠️  Sentiment worker exited ({self._process.exitcode}), restarting")
+                    self.stats['restarts'] += 1
+                self._start()
+            
+            self._next_batch_id += 1
+            batch_id = self._next_batch_id
+            self._requests.put((batch_id, texts))
+            
+            # The first batch also waits for the model to load
+            deadline = time.monotonic() + SENTIMENT_WORKER_TIMEOUT
+            while self._process.is_alive() and time.monotonic() < deadline:
+                try:
+                    response_id, results = self._responses.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if response_id == batch_id:
+                    return results
+            
+            if self._process.is_alive():
+                print(f"⚠️  Sentiment worker timed out after {SENTIMENT_WORKER_TIMEOUT}s, restarting")
+                self.stats['restarts'] += 1
+                self._stop()
+        
+        self.stats['failed_batches'] += 1
+        return [dict(NEUTRAL_RESULT) for _ in texts]
+    
+    async def close(self):
+        """Stop the batcher and ask the worker to exit"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._process is not None and self._process.is_alive():
+            self._requests.put(None)
+            await asyncio.to_thread(self._process.join, 5)
+        self._stop()
+
+# Background model load started by warm_up()
+warmup_task = None
+
+def warm_up():
+    """
+    Start loading the model in the background (worker process or thread)
+    Until it finishes, analyze_sentiment() scores unseen texts NEUTRAL
+    (for good: those items are not rescored later).
+    Returns: task resolving to True once the model is loaded, or None if
+    a warm-up was already started
+    """
+    global warmup_task
+    if warmup_task is not None:
+        return None
+    
+    if SENTIMENT_WORKER:
+        load = asyncio.to_thread(get_sentiment_worker().start)
+    else:
+        load = asyncio.to_thread(lambda: get_sentiment_analyzer().enabled)
+    warmup_task = asyncio.ensure_future(load)
+    return warmup_task
+
+def is_model_loading():
+    """True while a warm-up is still in progress"""
+    return warmup_task is not None and not warmup_task.done()
+
+# Global instance (one worker process per bot)
+sentiment_worker = None
+
+def get_sentiment_worker():
+    """Get or create sentiment worker singleton"""
+    global sentiment_worker
+    if sentiment_worker is None:
+        sentiment_worker = SentimentWorker()
+    return sentiment_worker
+
+async def analyze_sentiment(texts):
+    """
+    Sentiment for many texts without blocking the event loop
+    Cached results are reused; only unseen texts (each once) reach the
+    model, in the worker process or a thread when SENTIMENT_WORKER is off.
+    While warm_up() is still loading the model they come back NEUTRAL,
+    and those items are not revisited once it is up.
+    Returns: list of {'label', 'score'}, in input order
+    """
+    cache = get_sentiment_cache()
+    keys = [cache.key(text) for text in texts]
+    results = await cache.get_many(set(keys))
+    
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in results:
+            pending.setdefault(key, text)
+    
+    if pending:
+        if is_model_loading():
+            # Final for these items: their content is marked seen, so no later
+            # scan rescores them (the NEUTRAL result itself is not cached)
+            print(f"  ⏳ Sentiment model still loading; {len(pending)} items scored NEUTRAL")
+            fresh = [dict(NEUTRAL_RESULT) for _ in pending]
+        elif SENTIMENT_WORKER:
+            fresh = await get_sentiment_worker().analyze_many(list(pending.values()))
+        else:
+            fresh = await asyncio.to_thread(get_sentiment_analyzer().analyze_many, list(pending.values()))
+        
+        fresh = dict(zip(pending, fresh))
+        await cache.put_many(fresh)
+        results.update(fresh)
+    
+    return [dict(results[key]) for key in keys]
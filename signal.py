@@ -1,7 +1,8 @@
 from datetime import datetime
 from signals.rules import RulesEngine
 from processing.extractor import extract_entities
-from processing.sentiment import get_sentiment_analyzer
+from processing.sentiment import SentimentAnalyzer
+from processing.sentiment_worker import analyze_sentiment
 from config.settings import MIN_CONFIDENCE
 
 class SignalDetector:
@@ -9,13 +10,46 @@ class SignalDetector:
     
     def __init__(self):
         self.rules = RulesEngine()
-        self.sentiment_analyzer = get_sentiment_analyzer()
     
     async def detect(self, content):
         """
         Detect if content contains a tradeable signal
         Returns: Signal dict or None
         """
+        signals = await self.detect_many([content])
+        return signals[0] if signals else None
+    
+    async def detect_many(self, contents):
+        """
+        Detect signals across a batch of content
+        Rules and thresholds run per item first; sentiment is then computed
+        in one batched pass for the survivors only.
+        Returns: list of signal dicts
+        """
+        candidates = []
+        for content in contents:
+            signal = self._evaluate(content)
+            if signal:
+                candidates.append((signal, content.get('text', '')))
+        
+        if not candidates:
+            return []
+        
+        # Apply sentiment analysis
+        results = await analyze_sentiment([text for _, text in candidates])
+        
+        signals = []
+        for (signal, _), result in zip(candidates, results):
+            signal['sentiment'] = SentimentAnalyzer.direction(result)
+            signals.append(signal)
+        
+        return signals
+    
+    def _evaluate(self, content):
+        """
+        Rules and confidence for one item (everything except sentiment)
+        Returns: Signal dict without 'sentiment', or None
+        """
         
         # Extract structured info
         entities = extract_entities(content.get('text', ''))
@@ -37,9 +71,6 @@ class SignalDetector:
         if content.get('source') in ['SEC', 'FRED', 'Company IR']:
             base_confidence *= 1.1
         
-        # Apply sentiment analysis
-        sentiment = self.sentiment_analyzer.get_sentiment_direction(content.get('text', ''))
-        
         final_confidence = min(base_confidence, 1.0)
         
         # Threshold check
@@ -47,7 +78,7 @@ class SignalDetector:
             return None
         
         # Build signal
-        signal = {
+        return {
             'ticker': ticker,
             'signal_type': rule_result['signal_type'],
             'category': rule_result['category'],
@@ -55,12 +86,10 @@ class SignalDetector:
             'details': self._generate_details(content, entities, rule_result),
             'confidence': final_confidence,
             'timestamp': content.get('timestamp', datetime.now()),
+            'source': content.get('source', ''),
             'source_url': content.get('url', ''),
-            'is_opinion': False,
-            'sentiment': sentiment
+            'is_opinion': False
         }
-        
-        return signal
     
     def _generate_headline(self, content, entities):
         """Generate concise headline for alert"""
@@ -31,6 +31,48 @@ SEC_CIK_MAP = {
     # Add more as needed
 }
 
+# Company Name Aliases (matched as whole words, case-insensitive)
+COMPANY_ALIASES = {
+    'APPLE': 'AAPL',
+    'MICROSOFT': 'MSFT',
+    'ALPHABET': 'GOOGL',
+    'GOOGLE': 'GOOGL',
+    'AMAZON': 'AMZN',
+    'NVIDIA': 'NVDA',
+    'META': 'META',
+    'META PLATFORMS': 'META',
+    'FACEBOOK': 'META',
+    'TESLA': 'TSLA',
+    'AMD': 'AMD',
+    'ADVANCED MICRO DEVICES': 'AMD',
+    'BROADCOM': 'AVGO',
+    'MARVELL': 'MRVL',
+    'PALANTIR': 'PLTR',
+    'SNOWFLAKE': 'SNOW',
+    'TSMC': 'TSM',
+    'TAIWAN SEMI': 'TSM',
+    'TAIWAN SEMICONDUCTOR': 'TSM',
+    'ASML': 'ASML',
+    'ARM HOLDINGS': 'ARM',
+    'SUPER MICRO': 'SMCI',
+    'SUPERMICRO': 'SMCI',
+    'ARISTA': 'ANET',
+    'ARISTA NETWORKS': 'ANET',
+    'DATADOG': 'DDOG',
+    'COSTCO': 'COST',
+    'MASTERCARD': 'MA',
+    'UNITEDHEALTH': 'UNH',
+    'ELI LILLY': 'LLY',
+    'JOHNSON & JOHNSON': 'JNJ',
+    'INTEL': 'INTC',
+    'BANK OF AMERICA': 'BAC',
+    'WELLS FARGO': 'WFC',
+    'EXXON': 'XOM',
+    'EXXONMOBIL': 'XOM',
+    'CHEVRON': 'CVX',
+    # Add more as needed
+}
+
 # FRED Series IDs (Economic Data)
 FRED_SERIES = {
     'CPI': 'CPIAUCSL',
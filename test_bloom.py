@@ -0,0 +1,17 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from database.bloom import RotatingBloomFilter
+
+def _hash(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+def test_full_window_fits_memory_cap():
+    # Large enough per day that the cap, not the FP target, sets the size
+    content_filter = RotatingBloomFilter(days=14, items_per_day=50_000, max_bytes=140_000)
+    today = datetime.now(timezone.utc).date()
+    for back in range(16):
+        content_filter.add(_hash(back), today - timedelta(days=back))
+    
+    assert len(content_filter.filters) == 15
+    assert content_filter.memory_bytes() <= 140_000
+    assert content_filter.might_contain(_hash(14))
\ No newline at end of file
@@ -0,0 +1,187 @@
+import asyncio
+import sqlite3
+import pytest
+import database.bloom as bloom
+
+@pytest.mark.asyncio
+async def test_writer_survives_cancelled_waiter(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    # The waiter gives up before the group commits; its write still lands
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(models.save_feed_state('feed', 'entry-1', None, None), 0.001)
+    
+    await asyncio.wait_for(models.get_writer().flush(), 5)
+    assert not models.get_writer()._task.done()
+    assert (await models.get_feed_state('feed'))['last_entry_id'] == 'entry-1'
+    
+    # Later writes still resolve
+    await asyncio.wait_for(models.save_feed_state('feed', 'entry-2', None, None), 5)
+    assert (await models.get_feed_state('feed'))['last_entry_id'] == 'entry-2'
+
+@pytest.mark.asyncio
+async def test_dedup_window_matches_after_restart(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    await models.cache_contents([('a' * 64, 'AAPL', 'Reuters'), ('b' * 64, 'AAPL', 'Reuters')])
+    await models.get_writer().flush()
+    
+    db = await models.get_db()
+    await db.execute("UPDATE content_cache SET created_at = datetime('now', '-20 days') WHERE content_hash = ?", ('a' * 64,))
+    await db.commit()
+    
+    # Reload the Bloom filter as a restart would
+    bloom.content_filter = None
+    await models.load_content_filter()
+    assert await models.find_duplicates(['a' * 64, 'b' * 64]) == {'b' * 64}
+    
+    # Seeing it again restarts its window
+    await models.cache_contents([('a' * 64, 'AAPL', 'Reuters')])
+    await models.get_writer().flush()
+    async with db.execute("SELECT created_at > datetime('now', '-1 day') FROM content_cache WHERE content_hash = ?", ('a' * 64,)) as cursor:
+        assert (await cursor.fetchone())[0] == 1
+
+# Tables as the first release created them: no indexes, user_version 0
+BASELINE_SCHEMA = '''
+    CREATE TABLE signals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticker TEXT NOT NULL,
+        signal_type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        headline TEXT NOT NULL,
+        details TEXT,
+        confidence REAL NOT NULL,
+        timestamp DATETIME NOT NULL,
+        source_url TEXT,
+        is_opinion BOOLEAN DEFAULT 0,
+        alerted BOOLEAN DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE content_cache (
+        content_hash TEXT PRIMARY KEY,
+        ticker TEXT,
+        source TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE alert_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        signal_id INTEGER,
+        ticker TEXT NOT NULL,
+        timestamp DATETIME NOT NULL,
+        FOREIGN KEY (signal_id) REFERENCES signals(id)
+    );
+    CREATE TABLE ticker_cooldowns (
+        ticker TEXT PRIMARY KEY,
+        last_alert DATETIME NOT NULL
+    );
+    INSERT INTO signals (ticker, signal_type, category, headline, confidence, timestamp)
+    VALUES ('AAPL', 'earnings_beat', 'earnings', 'Apple beats', 0.9, datetime('now'));
+    INSERT INTO alert_history (signal_id, ticker, timestamp) VALUES (1, 'AAPL', datetime('now'));
+'''
+
+async def _pragma(db, name):
+    async with db.execute(f'PRAGMA {name}') as cursor:
+        return (await cursor.fetchone())[0]
+
+async def _index_names(db):
+    async with db.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'") as cursor:
+        return {row[0] for row in await cursor.fetchall()}
+
+EXPECTED_INDEXES = {
+    'idx_alert_history_timestamp', 'idx_alert_history_ticker', 'idx_signals_created_at',
+    'idx_signals_ticker', 'idx_content_cache_created_at', 'idx_sentiment_cache_created_at',
+}
+
+@pytest.mark.asyncio
+async def test_migrate_fresh_database(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    db = await models.get_db()
+    assert await _pragma(db, 'user_version') == len(models.MIGRATIONS)
+    assert await _pragma(db, 'auto_vacuum') == 2  # INCREMENTAL
+    assert await _index_names(db) == EXPECTED_INDEXES
+    
+    # Nothing left to apply on the next start
+    await models.migrate(db)
+    assert await _pragma(db, 'user_version') == len(models.MIGRATIONS)
+
+@pytest.mark.asyncio
+async def test_migrate_baseline_database(fresh_db):
+    models = fresh_db
+    with sqlite3.connect(models.DB_PATH) as baseline:
+        baseline.executescript(BASELINE_SCHEMA)
+    
+    await models.init_database()
+    
+    db = await models.get_db()
+    assert await _pragma(db, 'user_version') == len(models.MIGRATIONS)
+    assert await _pragma(db, 'auto_vacuum') == 2
+    assert await _index_names(db) == EXPECTED_INDEXES
+    async with db.execute('SELECT ticker FROM signals') as cursor:
+        assert await cursor.fetchall() == [('AAPL',)]
+    assert await models.get_alerts_today() == 1
+
+@pytest.mark.asyncio
+async def test_query_plans_use_indexes(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    for name, plan, ok in await models.check_query_plans():
+        assert ok, f"{name}: {plan}"
+
+@pytest.mark.asyncio
+async def test_retention_deletes_only_expired_rows(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    # One row a day past each table's TTL and one a day inside it
+    db = await models.get_db()
+    for table, column in models.RETENTION_COLUMNS.items():
+        days = models.RETENTION_DAYS[table]
+        for age in (days + 1, days - 1):
+            when = f"datetime('now', '-{age} days')"
+            if table == 'signals':
+                await db.execute(f'''
+                    INSERT INTO signals (ticker, signal_type, category, headline, confidence, timestamp, created_at)
+                    VALUES ('AAPL', 'earnings_beat', 'earnings', '{age}', 0.9, {when}, {when})
+                ''')
+            elif table == 'alert_history':
+                await db.execute(f"INSERT INTO alert_history (signal_id, ticker, timestamp) VALUES (NULL, '{age}', {when})")
+            else:
+                await db.execute(f"INSERT INTO content_cache (content_hash, created_at) VALUES ('{age}', {when})")
+    await db.commit()
+    
+    assert await models.run_retention() == {table: 1 for table in models.RETENTION_COLUMNS}
+    
+    for table, key in (('signals', 'headline'), ('alert_history', 'ticker'), ('content_cache', 'content_hash')):
+        async with db.execute(f'SELECT {key} FROM {table}') as cursor:
+            assert await cursor.fetchall() == [(str(models.RETENTION_DAYS[table] - 1),)]
+
+@pytest.mark.asyncio
+async def test_first_calls_share_one_connection(fresh_db):
+    models = fresh_db
+    connections = await asyncio.gather(*(models.get_db() for _ in range(5)))
+    assert all(db is connections[0] for db in connections)
+
+@pytest.mark.asyncio
+async def test_reinit_leaves_writer_group_alone(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    # on_ready after a reconnect, while a group transaction is open
+    started, release = asyncio.Event(), asyncio.Event()
+    async def write(db):
+        await db.execute("INSERT INTO ticker_cooldowns (ticker, last_alert) VALUES ('AAPL', datetime('now'))")
+        started.set()
+        await release.wait()
+    
+    pending = models.get_writer().submit(write)
+    await started.wait()
+    await models.init_database()
+    release.set()
+    
+    await asyncio.wait_for(pending, 5)
+    assert models.get_writer().stats['failed'] == 0
+    assert await models.is_on_cooldown('AAPL')
@@ -0,0 +1,97 @@
+import re
+import pytest
+from processing.extractor import extract_entities
+
+# Edge cases for extraction: substring keywords, unit suffixes, overlapping numbers
+# text -> (event_type, numbers) expected from extract_entities()
+GOLDEN = {
+    "NVIDIA announces record data center revenue of $30.8 billion, up 112%":
+        ('earnings', {'percentages': [112.0]}),
+    "Apple Inc. files 8-K: departure of chief operating officer":
+        ('management', {}),
+    "Fed holds rates steady as inflation cools; Treasury yields fall":
+        ('general', {}),
+    "Taiwan Semi and ASML shares slide after export curbs widen":
+        ('general', {}),
+    "Microsoft to acquire gaming studio in $2.1B all-cash deal":
+        ('general', {}),
+    "Costco reports same-store sales up 7.1% in September":
+        ('general', {'percentages': [7.1]}),
+    "Revenue: $94.9B; EPS: $1.64 beat; gross margin 46.2%":
+        ('earnings', {'revenue': 94.9e9, 'eps': 1.64, 'percentages': [46.2]}),
+    "revenue 5 by quarter end, eps 0.5":
+        ('earnings', {'revenue': 5e9, 'eps': 0.5}),  # "by" reads as billions, as it always has
+    "REVENUE $12 Million, 3.5% growth, 12.5%% and 100%":
+        ('earnings', {'revenue': 12e6, 'percentages': [3.5, 12.5, 100.0]}),
+    "Second release of steps: the company's releaseps were announced":
+        ('earnings', {}),
+    "FTC opens investigation into merger; CEO departure follows":
+        ('ma', {}),
+    "Raises full-year guidance to $1.2B; buyback of 250,000 shares":
+        ('general', {'guidance': 1.2e9, 'shares': 250000.0}),
+    "Outlook: $45 billion revenue, 1.5 million common shares issued":
+        ('earnings', {'guidance': 45e9, 'shares': 1.5e6}),
+    "No numbers or keywords in this line at all":
+        ('general', {}),
+    "":
+        ('general', {}),
+}
+GOLDEN_TEXTS = list(GOLDEN)
+
+# The extractor before it was precompiled (also timed by benchmarks.py extractor)
+def _legacy_numbers(text):
+    numbers = {}
+    revenue_match = re.search(r'revenue[:\s]+\$?(\d+\.?\d*)\s*(billion|million|B|M)?', text, re.IGNORECASE)
+    if revenue_match:
+        value = float(revenue_match.group(1))
+        unit = revenue_match.group(2)
+        if unit and unit.lower() in ['billion', 'b']:
+            value *= 1_000_000_000
+        elif unit and unit.lower() in ['million', 'm']:
+            value *= 1_000_000
+        numbers['revenue'] = value
+    eps_match = re.search(r'EPS[:\s]+\$?(\d+\.?\d*)', text, re.IGNORECASE)
+    if eps_match:
+        numbers['eps'] = float(eps_match.group(1))
+    pct_matches = re.findall(r'(\d+\.?\d*)%', text)
+    if pct_matches:
+        numbers['percentages'] = [float(p) for p in pct_matches]
+    return numbers
+
+def _legacy_event_type(text):
+    text_lower = text.lower()
+    if any(word in text_lower for word in ['earnings', 'revenue', 'eps', 'profit']):
+        return 'earnings'
+    elif any(word in text_lower for word in ['acquisition', 'merger', 'acquired', 'bought']):
+        return 'ma'
+    elif any(word in text_lower for word in ['ceo', 'cfo', 'executive', 'appointment', 'departure']):
+        return 'management'
+    elif any(word in text_lower for word in ['product', 'launch', 'release', 'announced']):
+        return 'product'
+    elif any(word in text_lower for word in ['regulation', 'sec', 'ftc', 'investigation']):
+        return 'regulatory'
+    return 'general'
+
+def legacy_extract(text):
+    """(event_type, numbers) as the extractor computed them before it was precompiled"""
+    return _legacy_event_type(text), _legacy_numbers(text)
+
+def golden_mismatches():
+    """Golden texts whose pre-existing extractor fields differ from legacy_extract()"""
+    mismatches = []
+    for text in GOLDEN_TEXTS:
+        entities = extract_entities(text)
+        numbers = {k: v for k, v in entities['numbers'].items() if k in ('revenue', 'eps', 'percentages')}
+        if (entities['event_type'], numbers) != legacy_extract(text):
+            mismatches.append((text, legacy_extract(text), (entities['event_type'], numbers)))
+    return mismatches
+
+def test_golden_corpus_unchanged():
+    # event_type, revenue, eps and percentages must match the pre-precompiled extractor
+    mismatches = golden_mismatches()
+    assert not mismatches, f"{len(mismatches)}/{len(GOLDEN_TEXTS)} golden texts changed: {mismatches}"
+
+@pytest.mark.parametrize('text', GOLDEN_TEXTS)
+def test_golden_expected(text):
+    entities = extract_entities(text)
+    assert (entities['event_type'], entities['numbers']) == GOLDEN[text]
@@ -0,0 +1,6 @@
+from config.settings import IMPORT_TIME_BUDGET_MS
+from import_time import measure_imports, format_report
+
+def test_bot_import_within_budget():
+    total_ms, direct = measure_imports()
+    assert total_ms <= IMPORT_TIME_BUDGET_MS, format_report(total_ms, direct)
@@ -0,0 +1,23 @@
+from processing.near_dup import content_tokens, NearDuplicateFilter
+
+def test_publisher_suffix_stripped_from_title_only():
+    # Google News: title + ' ' + summary, the publisher mid-text
+    gnews = {
+        'title': 'Apple raises dividend - Reuters',
+        'text': 'Apple raises dividend - Reuters Board approves increase',
+    }
+    assert content_tokens(gnews) == ['apple', 'raises', 'dividend', 'board', 'approves', 'increase']
+    
+    # RSS: 'title - summary'; a short summary is not a publisher name
+    rss = {'title': 'Apple raises dividend', 'text': 'Apple raises dividend - Board approves'}
+    assert content_tokens(rss) == ['apple', 'raises', 'dividend', 'board', 'approves']
+
+def test_same_story_from_two_publishers_is_dropped():
+    summary = ' Nvidia said quarterly revenue rose on data center demand'
+    contents = [
+        {'source': 'Reuters', 'title': 'Nvidia beats estimates - Reuters',
+         'text': 'Nvidia beats estimates - Reuters' + summary},
+        {'source': 'Google News', 'title': 'Nvidia beats estimates - Yahoo Finance',
+         'text': 'Nvidia beats estimates - Yahoo Finance' + summary},
+    ]
+    assert len(NearDuplicateFilter().filter(contents)) == 1
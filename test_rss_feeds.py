@@ -0,0 +1,27 @@
+import pytest
+from datetime import datetime
+from ingestion.rss_feeds import RSSIngestor
+
+@pytest.mark.asyncio
+async def test_google_news_batch_keeps_queried_tickers(monkeypatch):
+    titles = [
+        'Apple cuts cost of iPhone production',
+        'Microsoft and Apple sign deal',
+        'Tesla v. Ford lawsuit',
+    ]
+    
+    async def fetch_feed(feed_url, feed_key, since=None, watermarks=None):
+        return [
+            {'id': title, 'title': title, 'summary': '', 'link': '', 'published': datetime.now()}
+            for title in titles
+        ]
+    
+    ingestor = RSSIngestor()
+    monkeypatch.setattr(ingestor, '_fetch_feed', fetch_feed)
+    news = await ingestor._get_google_news_batch(['AAPL', 'NVDA'], 24)
+    
+    # Symbols the query didn't ask for (COST, MSFT, V) never become the ticker
+    assert [(item['title'], item['ticker']) for item in news] == [
+        ('Apple cuts cost of iPhone production', 'AAPL'),
+        ('Microsoft and Apple sign deal', 'AAPL'),
+    ]
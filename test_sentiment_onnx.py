@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+from processing.sentiment_onnx import OnnxSentimentPipeline
+
+class RecordingTokenizer:
+    """Stands in for tokenizers.Tokenizer: pads and truncates by its current settings"""
+    
+    def __init__(self):
+        self.padding = False
+        self.max_length = None
+    
+    def enable_padding(self):
+        self.padding = True
+    
+    def no_padding(self):
+        self.padding = False
+    
+    def enable_truncation(self, max_length):
+        self.max_length = max_length
+    
+    def no_truncation(self):
+        self.max_length = None
+    
+    def encode_batch(self, texts):
+        ids = [list(range(len(text.split())))[:self.max_length] for text in texts]
+        if self.padding:
+            width = max(len(row) for row in ids)
+            ids = [row + [0] * (width - len(row)) for row in ids]
+        return [SimpleNamespace(ids=row) for row in ids]
+
+def test_tokenizer_ignores_earlier_calls():
+    pipeline = OnnxSentimentPipeline.__new__(OnnxSentimentPipeline)
+    pipeline._tokenizer = RecordingTokenizer()
+    texts = ['one two three four', 'one']
+    
+    pipeline._encode(texts, True, True, 2)  # A padded, truncated batch first
+    assert pipeline.tokenizer(texts, truncation=False)['input_ids'] == [[0, 1, 2, 3], [0]]
+    
+    pipeline.tokenizer(texts)
+    assert [e.ids for e in pipeline._encode(texts, True, False, 512)] == [[0, 1, 2, 3], [0, 0, 0, 0]]
@@ -0,0 +1,21 @@
+import pytest
+from datetime import datetime
+from ingestion.watermark import Watermarks, record_feed_state
+
+@pytest.mark.asyncio
+async def test_feed_state_waits_for_commit(fresh_db):
+    models = fresh_db
+    await models.init_database()
+    
+    watermarks = await Watermarks.load('News')
+    watermarks.accept('rss:Reuters', datetime(2024, 1, 2), 'entry-2')
+    await record_feed_state(watermarks, 'rss:Reuters', 'entry-2', '"etag-2"', None)
+    await models.get_writer().flush()
+    
+    # A scan that fails before commit() leaves the old polling state
+    assert await models.get_feed_state('rss:Reuters') == {}
+    
+    await watermarks.commit()
+    await models.get_writer().flush()
+    assert (await models.get_feed_state('rss:Reuters'))['etag'] == '"etag-2"'
+    assert 'rss:Reuters' in await models.get_watermarks('News')
@@ -0,0 +1,88 @@
+import re
+from config.settings import WATCHLIST
+from config.sources import COMPANY_ALIASES
+
+def _trie_pattern(node):
+    """Render a character trie as a regex with shared prefixes factored out"""
+    terminal = '' in node
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    
+    if not branches:
+        return ''
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    
+    group = '(?:' + '|'.join(branches) + ')'
+    return group + '?' if terminal else group
+
+def build_pattern(words):
+    """One compiled alternation matching any of `words` as a whole word, case-insensitive"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    
+    # Lookarounds rather than \b so symbols like 'BRK.B' still anchor correctly
+    return re.compile(r'(?<!\w)' + _trie_pattern(trie) + r'(?!\w)', re.IGNORECASE)
+
+class TickerMatcher:
+    """
+    Compiled ticker and company-name matcher
+    Built once from the watchlist plus an alias table; a single regex pass
+    finds every mention, so cost stays flat as the watchlist grows.
+    """
+    
+    def __init__(self, tickers, aliases=None):
+        tickers = set(tickers)
+        
+        # Matched text (upper-cased) -> (ticker, is_symbol)
+        self.lookup = {
+            alias.upper(): (ticker, False)
+            for alias, ticker in (aliases or {}).items()
+            if ticker in tickers
+        }
+        self.lookup.update({ticker.upper(): (ticker, True) for ticker in tickers})
+        
+        self.pattern = build_pattern(self.lookup) if self.lookup else None
+    
+    def find_all(self, text, aliases=True):
+        """
+        Every ticker mention in text, in order
+        Returns: list of (ticker, start, end)
+        """
+        if not text or self.pattern is None:
+            return []
+        
+        matches = []
+        for match in self.pattern.finditer(text):
+            ticker, is_symbol = self.lookup[match.group().upper()]
+            if is_symbol or aliases:
+                matches.append((ticker, match.start(), match.end()))
+        
+        return matches
+    
+    def first(self, text, aliases=True):
+        """Earliest ticker symbol mentioned, falling back to the earliest company name"""
+        if not text or self.pattern is None:
+            return None
+        
+        alias_hit = None
+        for match in self.pattern.finditer(text):
+            ticker, is_symbol = self.lookup[match.group().upper()]
+            if is_symbol:
+                return ticker
+            if aliases and alias_hit is None:
+                alias_hit = ticker
+        return alias_hit
+
+# Global instance (compiled once at startup)
+ticker_matcher = None
+
+def get_ticker_matcher():
+    """Get or create ticker matcher singleton for the watchlist"""
+    global ticker_matcher
+    if ticker_matcher is None:
+        ticker_matcher = TickerMatcher(WATCHLIST, COMPANY_ALIASES)
+    return ticker_matcher
@@ -1,83 +1,134 @@
 import hashlib
+from collections import Counter
 from urllib.parse import urlparse
 from config.settings import TRUSTED_SOURCES, SPONSORED_KEYWORDS, OPINION_URL_PATTERNS
 from config.sources import WHITELISTED_DOMAINS
-from database.models import is_duplicate, cache_content
+from database.models import find_duplicates, cache_contents
+from processing.extractor import extract_ticker
+
+# Opinion language (simple keyword approach)
+OPINION_INDICATORS = [
+    'i think', 'i believe', 'in my opinion', 'we believe',
+    'could', 'might', 'may', 'should',
+    'overvalued', 'undervalued', 'likely to',
+    'prediction', 'forecast', 'expect'
+]
+OPINION_THRESHOLD = 3  # Multiple opinion indicators
+
+# Sources whose items must mention a watched ticker
+TICKER_REQUIRED_SOURCES = {'Google News', 'Reuters'}
 
 class ContentValidator:
-    """Validate content quality and filter out ads/opinions"""
+    """
+    Validate content quality and filter out ads/opinions
+    Stages run cheapest first, so only survivors of the in-memory checks
+    cost a database lookup; `stats` counts rejections per stage.
+    """
+    
+    def __init__(self):
+        self.trusted_sources = frozenset(TRUSTED_SOURCES)
+        self.whitelisted_domains = frozenset(domain.lower() for domain in WHITELISTED_DOMAINS)
+        self.sponsored_keywords = tuple(keyword.lower() for keyword in SPONSORED_KEYWORDS)
+        self.opinion_url_patterns = tuple(pattern.lower() for pattern in OPINION_URL_PATTERNS)
+        self.opinion_indicators = tuple(OPINION_INDICATORS)
+        self.stats = Counter()
+    
+    def is_whitelisted_domain(self, domain):
+        """True if the domain or any parent domain is whitelisted ('ir.sec.gov' yes, 'notsec.gov.evil.com' no)"""
+        labels = domain.split('.')
+        return any('.'.join(labels[i:]) in self.whitelisted_domains for i in range(len(labels)))
+    
+    def _reject(self, stage, reason):
+        self.stats[stage] += 1
+        return False, reason
     
     async def is_valid(self, content):
         """
         Multi-stage validation pipeline
         Returns: (is_valid: bool, reason: str)
         """
+        return (await self.validate_many([content]))[0]
+    
+    async def validate_many(self, contents):
+        """
+        Validate a scan's worth of content with one duplicate lookup and one
+        bulk insert, instead of two database round trips per item
+        Returns: [(is_valid: bool, reason: str)], in input order
+        """
+        results = [self._check(content) for content in contents]
+        
+        # Stage 7: Duplicate detection (the only stage that hits the database)
+        candidates = [
+            (i, hashlib.sha256(content.get('text', content.get('title', '')).encode()).hexdigest())
+            for i, (content, (passed, _)) in enumerate(zip(contents, results)) if passed
+        ]
+        seen = await find_duplicates(content_hash for _, content_hash in candidates)
+        
+        new_rows = []
+        for i, content_hash in candidates:
+            if content_hash in seen:  # Seen before, or earlier in this batch
+                results[i] = self._reject('duplicate', "Duplicate content")
+                continue
+            
+            seen.add(content_hash)
+            new_rows.append((content_hash, contents[i].get('ticker'), contents[i].get('source', '')))
+            self.stats['valid'] += 1
+        
+        # Passed all checks - cache them
+        await cache_contents(new_rows)
+        return results
+    
+    def _check(self, content):
+        """Stages 1-6 (everything in memory); (True, "Valid") if they all pass"""
+        self.stats['checked'] += 1
         
         # Stage 1: Source whitelist check
         source = content.get('source', '')
-        if source and source not in TRUSTED_SOURCES and source != 'Google News':
+        if source and source not in self.trusted_sources and source != 'Google News':
             # Google News gets special handling since it aggregates
             if 'IR' not in source:  # Company IR sources are trusted
-                return False, f"Untrusted source: {source}"
+                return self._reject('source', f"Untrusted source: {source}")
         
         # Stage 2: URL domain whitelist
         url = content.get('url', '')
-        if url:
-            domain = urlparse(url).netloc.lower()
-            domain = domain.replace('www.', '')
+        url_lower = url.lower()
+        if url and source != 'Google News':
+            domain = urlparse(url_lower).hostname or ''
+            if domain.startswith('www.'):
+                domain = domain[4:]
             
-            # Check if domain is whitelisted or is a known company
-            is_whitelisted = any(
-                whitelisted in domain 
-                for whitelisted in WHITELISTED_DOMAINS
-            )
-            
-            if not is_whitelisted and source != 'Google News':
-                return False, f"Non-whitelisted domain: {domain}"
-        
-        # Stage 3: Duplicate detection
-        text = content.get('text', content.get('title', ''))
-        content_hash = hashlib.sha256(text.encode()).hexdigest()
+            # Check if domain (or a parent domain) is whitelisted
+            if not self.is_whitelisted_domain(domain):
+                return self._reject('domain', f"Non-whitelisted domain: {domain}")
         
-        if await is_duplicate(content_hash):
-            return False, "Duplicate content"
+        # Stage 3: Opinion URL patterns
+        for pattern in self.opinion_url_patterns:
+            if pattern in url_lower:
+                return self._reject('opinion_url', f"Opinion URL pattern: {pattern}")
         
         # Stage 4: Sponsored content keywords
+        text = content.get('text', content.get('title', ''))
         text_lower = text.lower()
-        for keyword in SPONSORED_KEYWORDS:
+        for keyword in self.sponsored_keywords:
             if keyword in text_lower:
-                return False, f"Contains sponsored keyword: {keyword}"
-        
-        # Stage 5: Opinion URL patterns
-        if url:
-            for pattern in OPINION_URL_PATTERNS:
-                if pattern in url.lower():
-                    return False, f"Opinion URL pattern: {pattern}"
+                return self._reject('sponsored', f"Contains sponsored keyword: {keyword}")
         
-        # Stage 6: Opinion language detection (simple keyword approach)
-        opinion_indicators = [
-            'i think', 'i believe', 'in my opinion', 'we believe',
-            'could', 'might', 'may', 'should',
-            'overvalued', 'undervalued', 'likely to',
-            'prediction', 'forecast', 'expect'
-        ]
+        # Stage 5: Opinion language detection
+        opinion_count = 0
+        for indicator in self.opinion_indicators:
+            if indicator in text_lower:
+                opinion_count += 1
+                if opinion_count >= OPINION_THRESHOLD:
+                    return self._reject('opinion_language', "Contains opinion language")
         
-        opinion_count = sum(1 for indicator in opinion_indicators if indicator in text_lower)
-        if opinion_count >= 3:  # Multiple opinion indicators
-            return False, "Contains opinion language"
-        
-        # Stage 7: Ticker relevance (only for news items)
-        if source in ['Google News', 'Reuters'] and not content.get('ticker'):
+        # Stage 6: Ticker relevance (only for news items)
+        if source in TICKER_REQUIRED_SOURCES and not content.get('ticker'):
             # Try to extract ticker from text
-            from processing.extractor import extract_ticker
             ticker = extract_ticker(text)
             if not ticker:
-                return False, "No relevant ticker found"
+                return self._reject('no_ticker', "No relevant ticker found")
             content['ticker'] = ticker
         
-        # Passed all checks - cache it
-        await cache_content(content_hash, content.get('ticker'), source)
-        
         return True, "Valid"
     
     def is_factual_language(self, text):
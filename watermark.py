@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from database.models import get_watermarks, save_watermarks, save_feed_state
+
+class Watermarks:
+    """
+    Per-feed scan watermarks for one ingestor
+    A watermark is the newest published timestamp seen on a feed plus the
+    entry IDs published at exactly that time, so ties are neither
+    re-processed nor dropped. Advances are held back until commit(), which
+    the bot calls once a scan's items have been processed. Feed polling
+    state (HTTP validators, last accession) is held back with them, so a
+    failed scan never 304s or stops short of items it did not process.
+    """
+    
+    def __init__(self, source, marks=None):
+        self.source = source
+        self.marks = marks or {}
+        self.pending = {}
+        self.pending_feed_states = {}
+    
+    @classmethod
+    async def load(cls, source):
+        return cls(source, await get_watermarks(source))
+    
+    def cutoff(self, feed, hours):
+        """Oldest timestamp worth fetching: the watermark, or the cold-start backfill window"""
+        mark = self.marks.get(feed)
+        if mark is None:
+            return datetime.now() - timedelta(hours=hours)
+        return mark[0]
+    
+    def is_new(self, feed, timestamp, entry_id):
+        """True if an entry is newer than the committed watermark"""
+        mark = self.marks.get(feed)
+        if mark is None:
+            return True
+        last_published, seen_ids = mark
+        return timestamp > last_published or (timestamp == last_published and entry_id not in seen_ids)
+    
+    def observe(self, feed, timestamp, entry_id):
+        """Record an entry handed on for processing"""
+        mark = self.pending.get(feed) or self.marks.get(feed)
+        if mark is None or timestamp > mark[0]:
+            self.pending[feed] = (timestamp, {entry_id})
+        elif timestamp == mark[0]:
+            self.pending[feed] = (timestamp, mark[1] | {entry_id})
+    
+    def accept(self, feed, timestamp, entry_id):
+        """is_new() + observe() for the common case"""
+        if not self.is_new(feed, timestamp, entry_id):
+            return False
+        self.observe(feed, timestamp, entry_id)
+        return True
+    
+    def defer_feed_state(self, feed_key, last_entry_id, etag, last_modified):
+        """Hold a feed's polling state until commit()"""
+        self.pending_feed_states[feed_key] = (last_entry_id, etag, last_modified)
+    
+    async def commit(self):
+        """Persist advanced watermarks and feed polling state together"""
+        await save_watermarks(self.source, self.pending, self.pending_feed_states)
+        self.marks.update(self.pending)
+        self.pending = {}
+        self.pending_feed_states = {}
+
+async def record_feed_state(watermarks, feed_key, last_entry_id, etag, last_modified):
+    """Save a feed's polling state: with the watermarks on commit if tracked, else now"""
+    if watermarks is None:
+        await save_feed_state(feed_key, last_entry_id, etag, last_modified)
+    else:
+        watermarks.defer_feed_state(feed_key, last_entry_id, etag, last_modified)
+
+def lookback_cutoff(watermarks, feed, hours):
+    """Cutoff for a feed: its watermark if tracked, else the plain `hours` window"""
+    if watermarks is None:
+        return datetime.now() - timedelta(hours=hours)
+    return watermarks.cutoff(feed, hours)